@@ -1,3 +1,4 @@
 from .agent import Agent, AgentBuilder
+from .streaming import StreamBroadcaster
 
-__all__ = ["Agent", "AgentBuilder"]
+__all__ = ["Agent", "AgentBuilder", "StreamBroadcaster"]
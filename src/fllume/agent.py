@@ -1,16 +1,383 @@
 import any_llm
+import asyncio
+import datetime
+import hashlib
+import inspect
 import json
 import logging
-from typing import Any, Callable, Generator, Iterator, Optional, Type, Union
-from pydantic import BaseModel
+import math
+import string
+import textwrap
+import threading
+import time
+import warnings
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Callable,
+    Generator,
+    Hashable,
+    Iterator,
+    Optional,
+    Type,
+    Union,
+)
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import from_json
+from any_llm.tools import callable_to_tool
 from any_llm.types.completion import (
     ChatCompletionMessage,
     ChatCompletionMessageFunctionToolCall,
     Function,
 )
 
+from .streaming import StreamBroadcaster
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# The most threads used to execute the tool calls of a single turn.
+_MAX_TOOL_WORKERS = 32
+
+# JSON is encoded and decoded with orjson when it is installed. Otherwise,
+# it is decoded by pydantic-core, which is faster than the json module, and
+# encoded by the json module, configured to give the same output as orjson,
+# so that what the model receives does not depend on orjson.
+if orjson is not None:
+    _json_loads = orjson.loads
+
+    def _json_dumps(
+        obj: Any,
+        default: Optional[Callable[[Any], Any]] = None,
+        sort_keys: bool = False,
+    ) -> bytes:
+        # Like the json module, accept non-string keys. Also encode numpy
+        # arrays natively, which tools for data analysis often return.
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=default, option=option)
+
+else:
+    _json_loads = from_json
+
+    def _json_dumps(
+        obj: Any,
+        default: Optional[Callable[[Any], Any]] = None,
+        sort_keys: bool = False,
+    ) -> bytes:
+        # Compact and UTF-8, like orjson
+        options = {"sort_keys": sort_keys, "separators": (",", ":")}
+        try:
+            return json.dumps(
+                obj, default=default, ensure_ascii=False, allow_nan=False, **options
+            ).encode()
+        except ValueError:
+            # NaN or infinities, which are not valid JSON, so encode them as
+            # null, like orjson. Circular references raise ValueError again.
+            if default is not None:
+                inner_default = default
+
+                def default(value: Any) -> Any:
+                    return _replace_non_finite(inner_default(value))
+
+            return json.dumps(
+                _replace_non_finite(obj),
+                default=default,
+                ensure_ascii=False,
+                allow_nan=False,
+                **options,
+            ).encode()
+
+
+def _replace_non_finite(obj: Any, containers: Optional[set[int]] = None) -> Any:
+    """Returns a copy of a JSON-like value with any NaN or infinite floats
+    replaced by None."""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if not isinstance(obj, (dict, list, tuple)):
+        return obj
+    # Track the containers being copied, to detect circular references
+    if containers is None:
+        containers = set()
+    if id(obj) in containers:
+        raise ValueError("Circular reference detected")
+    containers.add(id(obj))
+    if isinstance(obj, dict):
+        copy = {k: _replace_non_finite(v, containers) for k, v in obj.items()}
+    else:
+        copy = [_replace_non_finite(item, containers) for item in obj]
+    containers.remove(id(obj))
+    return copy
+
+
+def _json_default(obj: Any) -> Any:
+    """Encodes the values that JSON has no type for in tool results: dates
+    and times in ISO format and numpy values as lists or scalars, like
+    orjson does natively, and anything else as its string."""
+    if isinstance(obj, (datetime.date, datetime.time)):
+        return obj.isoformat()
+    tolist = getattr(obj, "tolist", None)
+    if tolist is not None:
+        return tolist()
+    return str(obj)
+
+
+def _split_prompt_template(
+    template: str,
+) -> Optional[tuple[tuple[str, Optional[str]], ...]]:
+    """Parses a format string once into its literal text and field names.
+
+    Only templates made of plain named fields are split, so that they can be
+    rendered by joining the pieces. Any other template (e.g., with format
+    specs, conversions or positional fields) returns None, to be rendered by
+    `str.format` instead. The pieces are plain data, so agents stay
+    picklable.
+    """
+    parsed = list(string.Formatter().parse(template))
+    if any(
+        name is not None and (not name.isidentifier() or spec or conversion)
+        for _, name, spec, conversion in parsed
+    ):
+        return None
+    return tuple((literal, name) for literal, name, _, _ in parsed)
+
+
+def _parse_tool_arguments(arguments: str) -> Union[dict[str, Any], str]:
+    """Parses the JSON arguments of a tool call. Invalid JSON is returned
+    as is, so that the error is reported to the LLM when the tool is run."""
+    try:
+        return _json_loads(arguments)
+    except ValueError:
+        return arguments
+
+
+def _tool_result_to_str(content: Any) -> str:
+    """Converts a tool's return value to the string content of a tool message.
+
+    Structured results are sent to the LLM as JSON rather than as their
+    Python repr. Values JSON has no type for are encoded by `_json_default`,
+    and NaN and infinities as null. Results that still cannot be encoded,
+    e.g., with circular references, fall back to `str`.
+    """
+    if isinstance(content, (dict, list, tuple)):
+        try:
+            return _json_dumps(content, default=_json_default).decode()
+        except (TypeError, ValueError):
+            # orjson raises TypeError and the json module ValueError for
+            # circular references
+            pass
+    return str(content)
+
+
+def _run_coroutine_function(
+    function: Callable[..., Any], arguments: dict[str, Any]
+) -> Any:
+    """Calls a coroutine function from sync code and runs it to completion.
+
+    If the calling thread already runs an event loop (e.g., in a Jupyter
+    notebook), the coroutine cannot run on a new loop in this thread, so it
+    runs in a separate one. The coroutine is only created by the runner, so
+    that it is never left un-awaited.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(function(**arguments))
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(lambda: asyncio.run(function(**arguments))).result()
+
+
+def _check_max_concurrency(max_concurrency: int) -> None:
+    """Checks that a batch of prompts is allowed to make progress."""
+    if max_concurrency < 1:
+        raise ValueError(f"max_concurrency must be at least 1, got {max_concurrency}.")
+
+
+def _system_message(content: str) -> dict[str, Any]:
+    """Builds a system message for the any-llm API."""
+    return {"role": "system", "content": content}
+
+
+def _user_message(content: str) -> dict[str, Any]:
+    """Builds a user message for the any-llm API."""
+    return {"role": "user", "content": content}
+
+
+def _tool_message(tool_call_id: str, content: str) -> dict[str, Any]:
+    """Builds the message holding the result of a tool call."""
+    return {"role": "tool", "tool_call_id": tool_call_id, "content": content}
+
+
+class _StreamedToolCall:
+    """A tool call being assembled from the deltas of a stream.
+
+    The argument fragments are collected in a list and joined once the call
+    is complete, since appending each one to a string would copy the whole
+    buffer every time, which is quadratic in the size of the arguments.
+    """
+
+    __slots__ = ("id", "name", "argument_parts", "arguments")
+
+    def __init__(self, tool_call_delta: Any):
+        function = tool_call_delta.function
+        self.id = tool_call_delta.id
+        self.name = function.name
+        self.argument_parts = [function.arguments] if function.arguments else []
+        self.arguments = None
+
+    def finish(self) -> str:
+        """Joins the argument fragments, returning the complete arguments."""
+        self.arguments = "".join(self.argument_parts)
+        return self.arguments
+
+
+class _ToolCallAssembler:
+    """Assembles the tool calls of one streamed response from its chunks.
+
+    Each tool call is passed to `start_tool_call` as soon as it is complete,
+    i.e., when the next one begins or when the stream finishes, so that it
+    can start running while the model is still streaming the others. This
+    is shared by the sync and async streams, which only differ in how they
+    run the tools.
+    """
+
+    __slots__ = ("tool_calls", "start_tool_call")
+
+    def __init__(self, start_tool_call: Callable[[_StreamedToolCall], None]):
+        self.tool_calls: list[_StreamedToolCall] = []
+        self.start_tool_call = start_tool_call
+
+    def add_chunk(self, chunk: Any) -> Any:
+        """Merges the tool call deltas of a chunk. Returns the delta of a
+        chunk without tool calls, to be passed on, and None otherwise."""
+        delta = chunk.choices[0].delta
+        tool_call_deltas = delta.tool_calls
+        tool_calls = self.tool_calls
+        assert not (delta.content and tool_calls), (
+            "Received a content chunk after a tool call was "
+            "already initiated in the stream."
+        )
+        if tool_call_deltas:
+            self._merge_tool_call_deltas(tool_call_deltas)
+            delta = None
+        return delta
+
+    def _merge_tool_call_deltas(self, tool_call_deltas: list[Any]) -> None:
+        """Merges streamed tool call deltas into the tool calls seen so far."""
+        tool_calls = self.tool_calls
+        n_tool_calls = len(tool_calls)
+        for tool_call_delta in tool_call_deltas:
+            index = tool_call_delta.index
+            if index == n_tool_calls:
+                # New tool call - the previous one is complete
+                if n_tool_calls:
+                    self.start_tool_call(tool_calls[-1])
+                tool_calls.append(_StreamedToolCall(tool_call_delta))
+                n_tool_calls += 1
+            else:
+                # Continuation - collect the arguments fragment
+                fragment = tool_call_delta.function.arguments
+                if fragment:
+                    tool_calls[index].argument_parts.append(fragment)
+
+    def finish(self) -> list[_StreamedToolCall]:
+        """Starts the last tool call, once the stream is over, and returns
+        all of them."""
+        if self.tool_calls:
+            self.start_tool_call(self.tool_calls[-1])
+        return self.tool_calls
+
+
+def _close_stream(completions: Iterator[Any]) -> None:
+    """Closes a stream of chunks early, if it supports it, e.g., to release
+    its connection."""
+    close = getattr(completions, "close", None)
+    if close is not None:
+        close()
+
+
+async def _aclose_stream(completions: AsyncIterator[Any]) -> None:
+    """Closes an async stream of chunks early, if it supports it."""
+    aclose = getattr(completions, "aclose", None)
+    if aclose is not None:
+        await aclose()
+
+
+def _build_tool_call_message(
+    tool_calls: list[_StreamedToolCall],
+) -> ChatCompletionMessage:
+    """Builds the assistant message for tool calls assembled from a stream.
+
+    The fields come straight from the provider's deltas, so the models are
+    constructed without re-running Pydantic validation. The result equals
+    the validated message.
+    """
+    return ChatCompletionMessage.model_construct(
+        role="assistant",
+        content=None,
+        tool_calls=[
+            ChatCompletionMessageFunctionToolCall.model_construct(
+                id=tool_call.id,
+                function=Function.model_construct(
+                    name=tool_call.name, arguments=tool_call.arguments
+                ),
+                type="function",
+            )
+            for tool_call in tool_calls
+        ],
+    )
+
+
+class _LRUCache:
+    """A minimal thread-safe least-recently-used cache, whose entries
+    optionally expire `ttl` seconds after they were cached."""
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[Any, Optional[float]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        """Returns the value cached for `key`, or None if there is none or
+        it has expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires is not None and time.monotonic() >= expires:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Caches `value` for `key`, evicting the least recently used entry
+        if the cache is full."""
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __getstate__(self) -> dict[str, Any]:
+        # The lock cannot be pickled, and the entries are specific to this
+        # process, so a copy starts out empty.
+        return {"maxsize": self.maxsize, "ttl": self.ttl}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(state["maxsize"], state["ttl"])
+
 
 class Agent:
     """An LLM-powered agent that can complete prompts, use tools, and more.
@@ -21,8 +388,46 @@ class Agent:
 
     It is recommended to create Agent instances using the fluent `AgentBuilder`
     by calling `Agent.builder()`.
+
+    An Agent never modifies its configuration or the contexts passed to it,
+    so a single instance can safely be shared across threads and concurrent
+    async tasks.
+
+    The values derived from the configuration, such as the tool schemas
+    and the system message, are built once at construction. Assigning
+    `instructions`, `tools`, `response_format`, `prompt_template` or
+    `params` rebuilds them, but changing the `tools` list or the `params`
+    dict in place has no effect; assign a new one instead.
+
+    Agents have no instance `__dict__`, to keep them small. Subclasses that
+    need extra attributes should declare them in their own `__slots__`.
     """
 
+    __slots__ = (
+        "__weakref__",
+        "model",
+        "_instructions",
+        "_tools",
+        "_response_format",
+        "_prompt_template",
+        "_params",
+        "cache_size",
+        "on_metrics",
+        "parallel_tools",
+        "tool_cache_size",
+        "tool_cache_ttl",
+        "stream_batch_chars",
+        "_tool_dict",
+        "_async_tool_names",
+        "_uncached_tool_names",
+        "_prompt_pieces",
+        "_completion_kwargs",
+        "_response_adapter",
+        "_response_cache",
+        "_tool_cache",
+        "_default_context",
+    )
+
     def __init__(
         self,
         model: str,
@@ -31,6 +436,12 @@ class Agent:
         response_format: Optional[Union[dict[str, Any], type[BaseModel]]] = None,
         prompt_template: Optional[str] = None,
         params: Optional[dict[str, Any]] = None,
+        cache_size: int = 0,
+        on_metrics: Optional[Callable[[dict[str, Any]], Any]] = None,
+        parallel_tools: bool = False,
+        tool_cache_size: int = 0,
+        tool_cache_ttl: Optional[float] = None,
+        stream_batch_chars: int = 0,
     ):
         """Initializes the Agent.
 
@@ -40,21 +451,186 @@ class Agent:
                 <https://mozilla-ai.github.io/any-llm/providers/>`_ for a
                 full list of providers, depending on how any-llm was installed.
             instructions: The system-level instructions for the agent.
-            tools: A list of Python functions to be used as tools.
-                Annotating each function with a docstring and type hints will
-                help the model make effective use of them.
+            tools: A list of Python functions to be used as tools. Each
+                function must have a docstring, and annotating it with type
+                hints will help the model make effective use of it. Tool calls
+                requested together in one turn are executed one at a time,
+                unless `parallel_tools` is set. Coroutine functions are
+                awaited by the async methods, and run in their own event loop
+                by the sync methods. Returned dicts, lists and tuples are
+                passed to the model as JSON, and any other value as a string.
             response_format: The desired format for the response, e.g., a
                 Pydantic model or a JSON schema.
             prompt_template: A template for formatting dictionary-based
                 prompts, as a format string.
             params: Additional parameters to pass to the LLM API.
+            cache_size: The maximum number of responses to keep in an LRU
+                cache keyed on the messages sent, so that repeated requests
+                skip the LLM. Only meant for deterministic parameters (e.g.,
+                a temperature of 0), the cache is never used for streaming,
+                for agents with tools (which may have side effects) or when
+                a non-zero temperature is set; in those cases, a warning is
+                issued and `cache_size` is set to 0. Defaults to 0 (no
+                caching).
+            on_metrics: A callback receiving a dict of timings for each
+                `complete` or `acomplete` call, e.g., to forward them to a
+                monitoring system. Every dict has the total time in
+                nanoseconds (`total_ns`). Streamed responses also report the
+                number of chunks (`chunks`), the time to the first chunk
+                (`ttft_ns`) and the rate of the remaining chunks
+                (`chunks_per_second`), once the stream is exhausted or
+                closed. The callback should return quickly, as it runs on
+                the calling thread.
+            parallel_tools: Whether to execute the tool calls requested
+                together in one turn concurrently, on threads (or as tasks,
+                in the async methods), so that a turn takes as long as its
+                slowest tool. Streamed tool calls then start as soon as each
+                one is complete. Only enable it for tools that are safe to
+                run at the same time, e.g., that do not mutate shared state
+                such as a common DataFrame. Defaults to False (the tools run
+                one at a time, in the requested order).
+            tool_cache_size: The maximum number of tool results to keep in
+                an LRU cache keyed on the tool name and arguments, so that
+                a tool called again with the same arguments, e.g., in a later
+                turn, is not run again. Only meant for deterministic tools
+                without side effects. Individual tools can be excluded by
+                setting a `_fllume_no_cache` attribute to True on the
+                function. Failed calls are never cached. Defaults to 0 (no
+                caching).
+            tool_cache_ttl: The number of seconds after which a cached tool
+                result expires. Defaults to None (never).
+            stream_batch_chars: The minimum number of characters in each
+                chunk of a streamed response. Tokens are buffered until
+                that many characters arrive, which reduces the number of
+                chunks at high token rates, at the cost of a coarser
+                stream. Defaults to 0 (each token is yielded as it arrives).
         """
         self.model = model
-        self.tools = tools if tools is not None else []
-        self.response_format = response_format
-        self.prompt_template = prompt_template
-        self.params = params if params is not None else {}
-        self.instructions = self._build_instructions(instructions)
+        # Copy the configuration, since the values derived from it below
+        # would go stale if the caller's list or dict changed later.
+        self._tools = list(tools) if tools is not None else []
+        self._response_format = response_format
+        self._prompt_template = prompt_template
+        self._params = dict(params) if params is not None else {}
+        self.cache_size = cache_size
+        self.on_metrics = on_metrics
+        self.parallel_tools = parallel_tools
+        self.tool_cache_size = tool_cache_size
+        self.tool_cache_ttl = tool_cache_ttl
+        self.stream_batch_chars = stream_batch_chars
+        self._instructions = self._build_instructions(instructions)
+        self._configure()
+
+    def _configure(self) -> None:
+        """Derives the values used by every call from the configuration.
+
+        Building these once spares the per-call work, so this runs at
+        construction and again whenever a configuration attribute is
+        assigned. The caches are emptied, as their entries may depend on the
+        previous configuration.
+        """
+        tools = self._tools
+        # The tools are looked up by name for every tool call
+        self._tool_dict = {tool.__name__: tool for tool in tools}
+        self._async_tool_names = frozenset(
+            tool.__name__ for tool in tools if inspect.iscoroutinefunction(tool)
+        )
+        self._uncached_tool_names = frozenset(
+            tool.__name__ for tool in tools if getattr(tool, "_fllume_no_cache", False)
+        )
+        response_format = self._response_format
+        # Validates the parsed responses into the response model, if any.
+        # Building the validator once spares resolving the model per call.
+        self._response_adapter = (
+            TypeAdapter(response_format)
+            if isinstance(response_format, type)
+            and issubclass(response_format, BaseModel)
+            else None
+        )
+        self._prompt_pieces = (
+            _split_prompt_template(self._prompt_template)
+            if self._prompt_template
+            else None
+        )
+        # The keyword arguments for any-llm, including the JSON schemas of
+        # the tools, which any-llm would otherwise derive from the functions
+        # on every call.
+        self._completion_kwargs = {
+            "tools": [callable_to_tool(tool) for tool in tools],
+            "response_format": response_format,
+            **self._params,
+        }
+        if self.cache_size > 0 and (tools or self._params.get("temperature")):
+            warnings.warn(
+                "The response cache is disabled for agents with tools or a "
+                "non-zero temperature, so cache_size is ignored.",
+                stacklevel=3,
+            )
+            self.cache_size = 0
+        self._response_cache = (
+            _LRUCache(self.cache_size) if self.cache_size > 0 else None
+        )
+        self._tool_cache = (
+            _LRUCache(self.tool_cache_size, self.tool_cache_ttl)
+            if self.tool_cache_size > 0
+            else None
+        )
+        # The context of a new conversation, which only holds the system
+        # message. It is a tuple, as it is shared by every call and is never
+        # extended in place: _build_messages() copies it into a new list.
+        self._default_context = (_system_message(self._instructions),)
+
+    @property
+    def instructions(self) -> str:
+        """The system-level instructions for the agent."""
+        return self._instructions
+
+    @instructions.setter
+    def instructions(self, instructions: str) -> None:
+        self._instructions = instructions
+        self._configure()
+
+    @property
+    def tools(self) -> list[Callable[..., Any]]:
+        """The functions the agent can call as tools."""
+        return self._tools
+
+    @tools.setter
+    def tools(self, tools: Optional[list[Callable[..., Any]]]) -> None:
+        self._tools = list(tools) if tools is not None else []
+        self._configure()
+
+    @property
+    def response_format(self) -> Optional[Union[dict[str, Any], type[BaseModel]]]:
+        """The desired format for the response, if any."""
+        return self._response_format
+
+    @response_format.setter
+    def response_format(
+        self, response_format: Optional[Union[dict[str, Any], type[BaseModel]]]
+    ) -> None:
+        self._response_format = response_format
+        self._configure()
+
+    @property
+    def prompt_template(self) -> Optional[str]:
+        """The template for formatting dictionary-based prompts, if any."""
+        return self._prompt_template
+
+    @prompt_template.setter
+    def prompt_template(self, prompt_template: Optional[str]) -> None:
+        self._prompt_template = prompt_template
+        self._configure()
+
+    @property
+    def params(self) -> dict[str, Any]:
+        """The additional parameters passed to the LLM API."""
+        return self._params
+
+    @params.setter
+    def params(self, params: Optional[dict[str, Any]]) -> None:
+        self._params = dict(params) if params is not None else {}
+        self._configure()
 
     @classmethod
     def builder(cls) -> "AgentBuilder":
@@ -95,72 +671,275 @@ class Agent:
         """
         Helper generator method to extract messages from
         any_llm.completion().
+
+        When the model requests tools, their results are added to `context`,
+        the list of messages owned by the stream, and the model's follow-up
+        response is streamed in turn, until it stops requesting tools.
         """
-        tool_calls = []
+        if not self.tools:
+            # Without tools there is nothing to accumulate, so pass each
+            # delta straight through to keep the time to first token low.
+            for chunk in completions:
+                yield chunk.choices[0].delta
+            return
 
-        for chunk in completions:
-            delta = chunk.choices[0].delta
-            assert not (delta.content and tool_calls), (
-                "Received a content chunk after a tool call was "
-                "already initiated in the stream."
-            )
+        # With parallel tools, each tool call starts running on the executor
+        # as soon as it is complete, while the model is still streaming the
+        # next ones. Otherwise, only the arguments are parsed, and the tools
+        # run one at a time after the stream.
+        executor = (
+            ThreadPoolExecutor(max_workers=_MAX_TOOL_WORKERS)
+            if self.parallel_tools
+            else None
+        )
 
-            if delta.tool_calls:
-                for tool_call_delta in delta.tool_calls:
-                    index = tool_call_delta.index
-                    if index == len(tool_calls):
-                        # New tool call - append the delta
-                        tool_calls.append(tool_call_delta)
-                    else:
-                        # Continuation - merge arguments
-                        tool_calls[
-                            index
-                        ].function.arguments += tool_call_delta.function.arguments
-            else:
-                yield delta
-
-        if tool_calls:
-            completed_tool_calls = [
-                ChatCompletionMessageFunctionToolCall(
-                    id=tc.id,
-                    function=Function(
-                        name=tc.function.name, arguments=tc.function.arguments
-                    ),
-                    type="function",
+        def start_tool_call(tool_call: _StreamedToolCall) -> None:
+            arguments = _parse_tool_arguments(tool_call.finish())
+            if executor is not None:
+                arguments = executor.submit(
+                    self._dispatch_tool_call, tool_call.name, arguments
                 )
-                for tc in tool_calls
-            ]
-            message = ChatCompletionMessage(
-                role="assistant", content=None, tool_calls=completed_tool_calls
-            )
-            yield from self._handle_tool_calls(message, context, stream=True)
+            started.append(arguments)
+
+        try:
+            # Stream each response in turn, rather than recursing into a new
+            # generator for each round of tool calls.
+            while True:
+                started = []
+                assembler = _ToolCallAssembler(start_tool_call)
+                add_chunk = assembler.add_chunk
+                for chunk in completions:
+                    delta = add_chunk(chunk)
+                    if delta is not None:
+                        yield delta
+                tool_calls = assembler.finish()
+                if not tool_calls:
+                    return
+                if executor is not None:
+                    contents = [future.result() for future in started]
+                else:
+                    contents = [
+                        self._dispatch_tool_call(tool_call.name, arguments)
+                        for tool_call, arguments in zip(tool_calls, started)
+                    ]
+                self._add_tool_results(context, tool_calls, contents)
+                completions = self._create_completion(context, stream=True)
+        finally:
+            _close_stream(completions)
+            # Do not wait for tools still running if the stream was closed
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _astream_messages(
+        self, completions: AsyncIterator[Any], context: list[dict[str, Any]]
+    ) -> AsyncGenerator[dict[str, Any], None]:
+        """
+        Helper async generator method to extract messages from
+        any_llm.acompletion(), following any tool calls like
+        _stream_messages().
+        """
+        if not self.tools:
+            # Without tools there is nothing to accumulate, so pass each
+            # delta straight through to keep the time to first token low.
+            async for chunk in completions:
+                yield chunk.choices[0].delta
+            return
+
+        # Like _stream_messages(), but with parallel tools, each complete tool
+        # call starts running as a task, which is cancelled if the stream
+        # ends early.
+        parallel_tools = self.parallel_tools
+        started = []
+
+        def start_tool_call(tool_call: _StreamedToolCall) -> None:
+            arguments = _parse_tool_arguments(tool_call.finish())
+            if parallel_tools:
+                arguments = asyncio.create_task(
+                    self._adispatch_tool_call(tool_call.name, arguments)
+                )
+            started.append(arguments)
+
+        try:
+            while True:
+                started = []
+                assembler = _ToolCallAssembler(start_tool_call)
+                add_chunk = assembler.add_chunk
+                async for chunk in completions:
+                    delta = add_chunk(chunk)
+                    if delta is not None:
+                        yield delta
+                tool_calls = assembler.finish()
+                if not tool_calls:
+                    return
+                if parallel_tools:
+                    contents = await asyncio.gather(*started)
+                else:
+                    contents = [
+                        await self._adispatch_tool_call(tool_call.name, arguments)
+                        for tool_call, arguments in zip(tool_calls, started)
+                    ]
+                self._add_tool_results(context, tool_calls, contents)
+                completions = await self._acreate_completion(context, stream=True)
+        finally:
+            await _aclose_stream(completions)
+            if parallel_tools:
+                for task in started:
+                    task.cancel()
 
     def _stream_content(
         self, completions: Generator[dict[str, Any], None, None]
     ) -> Generator[str, None, None]:
         """
         Helper generator method to extract content from
-        _stream_messages().
+        _stream_messages(), coalescing it into chunks of at least
+        `stream_batch_chars` characters if set.
+        """
+        batch_chars = self.stream_batch_chars
+        if not batch_chars:
+            for chunk in completions:
+                content = chunk.content
+                if content is not None:
+                    yield content
+            return
+        buffer = []
+        n_chars = 0
+        for chunk in completions:
+            content = chunk.content
+            if content is not None:
+                buffer.append(content)
+                n_chars += len(content)
+                if n_chars >= batch_chars:
+                    yield "".join(buffer)
+                    buffer.clear()
+                    n_chars = 0
+        if buffer:
+            yield "".join(buffer)
+
+    def _stream_raw_content(
+        self, completions: Iterator[Any]
+    ) -> Generator[str, None, None]:
+        """
+        Helper generator method to extract content directly from
+        any_llm.completion(), for agents without tools.
         """
         for chunk in completions:
-            if chunk.content is not None:
-                yield chunk.content
+            content = chunk.choices[0].delta.content
+            if content is not None:
+                yield content
+
+    async def _astream_raw_content(
+        self, completions: AsyncIterator[Any]
+    ) -> AsyncGenerator[str, None]:
+        """
+        Helper async generator method to extract content directly from
+        any_llm.acompletion(), for agents without tools.
+        """
+        async for chunk in completions:
+            content = chunk.choices[0].delta.content
+            if content is not None:
+                yield content
+
+    async def _astream_content(
+        self, completions: AsyncGenerator[dict[str, Any], None]
+    ) -> AsyncGenerator[str, None]:
+        """
+        Helper async generator method to extract content from
+        _astream_messages(), coalescing it like _stream_content().
+        """
+        batch_chars = self.stream_batch_chars
+        if not batch_chars:
+            async for chunk in completions:
+                content = chunk.content
+                if content is not None:
+                    yield content
+            return
+        buffer = []
+        n_chars = 0
+        async for chunk in completions:
+            content = chunk.content
+            if content is not None:
+                buffer.append(content)
+                n_chars += len(content)
+                if n_chars >= batch_chars:
+                    yield "".join(buffer)
+                    buffer.clear()
+                    n_chars = 0
+        if buffer:
+            yield "".join(buffer)
+
+    def _time_stream(
+        self, chunks: Generator[str, None, None], start_ns: int
+    ) -> Generator[str, None, None]:
+        """Passes a content stream through, reporting its timings to the
+        metrics hook once the stream is finished or closed."""
+        first_ns = None
+        n_chunks = 0
+        try:
+            for chunk in chunks:
+                if first_ns is None:
+                    first_ns = time.perf_counter_ns()
+                n_chunks += 1
+                yield chunk
+        finally:
+            self._report_stream_metrics(start_ns, first_ns, n_chunks)
+
+    async def _atime_stream(
+        self, chunks: AsyncGenerator[str, None], start_ns: int
+    ) -> AsyncGenerator[str, None]:
+        """Passes an async content stream through, reporting its timings to
+        the metrics hook once the stream is finished or closed."""
+        first_ns = None
+        n_chunks = 0
+        try:
+            async for chunk in chunks:
+                if first_ns is None:
+                    first_ns = time.perf_counter_ns()
+                n_chunks += 1
+                yield chunk
+        finally:
+            self._report_stream_metrics(start_ns, first_ns, n_chunks)
+
+    def _report_stream_metrics(
+        self, start_ns: int, first_ns: Optional[int], n_chunks: int
+    ) -> None:
+        end_ns = time.perf_counter_ns()
+        metrics = {"total_ns": end_ns - start_ns, "chunks": n_chunks}
+        if first_ns is not None:
+            metrics["ttft_ns"] = first_ns - start_ns
+            if n_chunks > 1 and end_ns > first_ns:
+                metrics["chunks_per_second"] = (
+                    (n_chunks - 1) * 1e9 / (end_ns - first_ns)
+                )
+        self.on_metrics(metrics)
 
     def _build_user_message(
         self, prompt: Union[str, dict[str, Any], None]
-    ) -> list[dict[str, Any]]:
-        """Builds the user message list from a string or dictionary prompt."""
+    ) -> Optional[dict[str, Any]]:
+        """Builds the user message from a string or dictionary prompt, or
+        returns None if there is no prompt."""
         prompt_str: Optional[str]
         if isinstance(prompt, dict):
             if not self.prompt_template:
                 raise ValueError(
                     "A dict prompt was provided, but the agent has no prompt_template."
                 )
-            prompt_str = self.prompt_template.format(**prompt)
+            prompt_str = self._render_prompt(prompt)
         else:
             prompt_str = prompt  # It's a string or None
 
-        return [{"role": "user", "content": prompt_str}] if prompt_str else []
+        return _user_message(prompt_str) if prompt_str else None
+
+    def _render_prompt(self, fields: dict[str, Any]) -> str:
+        """Renders the prompt template with the fields of a dict prompt."""
+        pieces = self._prompt_pieces
+        if pieces is None:
+            return self.prompt_template.format(**fields)
+        parts = []
+        for literal, name in pieces:
+            parts.append(literal)
+            if name is not None:
+                parts.append(format(fields[name]))
+        return "".join(parts)
 
     def complete_with_context(
         self,
@@ -187,73 +966,320 @@ class Agent:
             and the assistant's response.
         """
         if context is None:
-            context = [{"role": "system", "content": self.instructions}]
+            context = self._default_context
+
+        messages = self._build_messages(context, prompt)
+        completion = self._create_completion(messages, stream=stream)
+        if stream:
+            return self._stream_messages(completion, messages)
+
+        # Keep calling tools until the model gives a final response.
+        message = completion.choices[0].message
+        while message.tool_calls:
+            messages.append(message.model_dump(exclude_none=True))
+            messages.extend(self._call_tools(message.tool_calls))
+            completion = self._create_completion(messages)
+            message = completion.choices[0].message
+        messages.append(message)
+        return messages
+
+    async def acomplete_with_context(
+        self,
+        context: Optional[list[dict[str, Any]]] = None,
+        prompt: Union[str, dict[str, Any], None] = None,
+        stream: bool = False,
+    ) -> Union[list[dict[str, Any]], AsyncGenerator[dict[str, Any], None]]:
+        """Asynchronously executes a completion within a given conversational
+        context.
+
+        This is the asynchronous counterpart of `complete_with_context`, which
+        awaits the LLM instead of blocking the calling thread, so that many
+        conversations can make progress concurrently on one event loop.
+
+        Args:
+            context: The list of messages representing the conversation
+                history.
+            prompt: The new user prompt to add to the conversation.
+            stream: If True, the response will be returned as an async
+                generator of message objects. Defaults to False.
+
+        Returns:
+            If streaming, an async generator that yields message objects. If
+            not streaming, the updated context list including the new user
+            prompt and the assistant's response.
+        """
+        if context is None:
+            context = self._default_context
+
+        messages = self._build_messages(context, prompt)
+        completion = await self._acreate_completion(messages, stream=stream)
+        if stream:
+            return self._astream_messages(completion, messages)
+
+        # Keep calling tools until the model gives a final response.
+        message = completion.choices[0].message
+        while message.tool_calls:
+            messages.append(message.model_dump(exclude_none=True))
+            messages.extend(await self._acall_tools(message.tool_calls))
+            completion = await self._acreate_completion(messages)
+            message = completion.choices[0].message
+        messages.append(message)
+        return messages
 
+    def _build_messages(
+        self,
+        context: list[dict[str, Any]],
+        prompt: Union[str, dict[str, Any], None],
+    ) -> list[dict[str, Any]]:
+        """Builds the list of message dicts to send to the any-llm API.
+
+        The result is a new list owned by the caller, which extends it in
+        place with the rest of the turn. It also serves as the history of the
+        returned context, so each ChatCompletionMessage is converted to a dict
+        only once: on the first call after it was appended, rather than on
+        every later turn.
+        """
         # Convert any ChatCompletionMessages in the message history to dicts
         # before sending them to the any-llm API, which expects dicts.
-        context_as_dicts = [
+        messages = [
             (msg.model_dump(exclude_none=True) if isinstance(msg, BaseModel) else msg)
             for msg in context
         ]
-
         user_message = self._build_user_message(prompt)
-        completion = any_llm.completion(
-            self.model,
-            messages=context_as_dicts + user_message,
-            stream=stream,
-            tools=self.tools,
-            response_format=self.response_format,
-            **self.params,
-        )
-        if stream:
-            return self._stream_messages(completion, context)
-        else:
-            message = completion.choices[0].message
-            return self._handle_tool_calls(message, context)
+        if user_message is not None:
+            messages.append(user_message)
+        return messages
 
-    def _handle_tool_calls(
-        self, message: Any, context: list[dict[str, Any]], stream: bool = False
-    ) -> Union[list[dict[str, Any]], Generator[dict[str, Any], None, None]]:
-        """
-        Recursively handles tool calls until a final response is generated.
-        """
-        context = context + [message]
-        if message.tool_calls:
-            tool_messages = self._call_tools(message.tool_calls)
-            context = self.complete_with_context(context + tool_messages, stream=stream)
-        return context
+    def _create_completion(
+        self, messages: list[dict[str, Any]], stream: bool = False
+    ) -> Any:
+        """Requests a completion of the given messages from any-llm, or
+        returns a cached one."""
+        if stream or self._response_cache is None:
+            return any_llm.completion(
+                self.model,
+                messages=messages,
+                stream=stream,
+                **self._completion_kwargs,
+            )
+        key = self._cache_key(messages)
+        completion = self._response_cache.get(key)
+        if completion is None:
+            completion = any_llm.completion(
+                self.model, messages=messages, **self._completion_kwargs
+            )
+            self._response_cache.put(key, completion)
+        return completion
+
+    async def _acreate_completion(
+        self, messages: list[dict[str, Any]], stream: bool = False
+    ) -> Any:
+        """Asynchronously requests a completion of the given messages from
+        any-llm, or returns a cached one."""
+        if stream or self._response_cache is None:
+            return await any_llm.acompletion(
+                self.model,
+                messages=messages,
+                stream=stream,
+                **self._completion_kwargs,
+            )
+        key = self._cache_key(messages)
+        completion = self._response_cache.get(key)
+        if completion is None:
+            completion = await any_llm.acompletion(
+                self.model, messages=messages, **self._completion_kwargs
+            )
+            self._response_cache.put(key, completion)
+        return completion
+
+    def _cache_key(self, messages: list[dict[str, Any]]) -> bytes:
+        """Hashes the messages into a compact response cache key."""
+        return hashlib.blake2b(_json_dumps(messages, default=str)).digest()
+
+    def _add_tool_results(
+        self,
+        context: list[dict[str, Any]],
+        tool_calls: list[_StreamedToolCall],
+        contents: list[str],
+    ) -> None:
+        """Extends the context of a stream in place with the tool calls
+        assembled from it and their results."""
+        message = _build_tool_call_message(tool_calls)
+        context.append(message.model_dump(exclude_none=True))
+        context.extend(self._build_tool_messages(message.tool_calls, contents))
+
+    def _tool_cache_key(
+        self, tool_function: Callable[..., Any], arguments: dict[str, Any]
+    ) -> Optional[tuple[str, bytes]]:
+        """Returns the key of a tool call in the tool result cache, or None if
+        the result should not be cached."""
+        name = tool_function.__name__
+        if self._tool_cache is None or name in self._uncached_tool_names:
+            return None
+        # Sorting the keys makes the key independent of the argument order
+        try:
+            return name, _json_dumps(arguments, default=str, sort_keys=True)
+        except (TypeError, ValueError):
+            # E.g., NaN arguments without orjson; just run the tool
+            return None
 
     def _execute_tool_call(
         self, tool_function: Callable[..., Any], arguments: dict[str, Any]
     ) -> str:
         """Executes a tool function, catching any exceptions and returning
-        any error messages to the LLM."""
+        any error messages to the LLM. Coroutine tools are run to completion
+        in a new event loop, so that they also work with the sync methods."""
+        key, content = self._get_cached_tool_result(tool_function, arguments)
+        if content is not None:
+            return content
+        try:
+            if tool_function.__name__ in self._async_tool_names:
+                content = _run_coroutine_function(tool_function, arguments)
+            else:
+                content = tool_function(**arguments)
+        except Exception as e:
+            return self._tool_error_message(tool_function, arguments, e)
+        return self._finish_tool_result(key, content)
+
+    async def _aexecute_tool_call(
+        self, tool_function: Callable[..., Any], arguments: dict[str, Any]
+    ) -> str:
+        """Asynchronously executes a tool function. Coroutine tools are awaited
+        directly, while blocking tools run in a worker thread."""
+        if tool_function.__name__ not in self._async_tool_names:
+            return await asyncio.to_thread(
+                self._execute_tool_call, tool_function, arguments
+            )
+        key, content = self._get_cached_tool_result(tool_function, arguments)
+        if content is not None:
+            return content
         try:
-            content = tool_function(**arguments)
+            content = await tool_function(**arguments)
         except Exception as e:
+            return self._tool_error_message(tool_function, arguments, e)
+        return self._finish_tool_result(key, content)
+
+    def _get_cached_tool_result(
+        self, tool_function: Callable[..., Any], arguments: dict[str, Any]
+    ) -> tuple[Optional[tuple[str, bytes]], Optional[str]]:
+        """Returns the tool cache key of a tool call, and its cached result,
+        or None if it has none."""
+        key = self._tool_cache_key(tool_function, arguments)
+        if key is None:
+            return None, None
+        return key, self._tool_cache.get(key)
+
+    def _finish_tool_result(
+        self, key: Optional[tuple[str, bytes]], content: Any
+    ) -> str:
+        """Converts the return value of a successful tool call to the content
+        of its message, caching it under `key`, unless that is None."""
+        content = _tool_result_to_str(content)
+        if key is not None:
+            self._tool_cache.put(key, content)
+        return content
+
+    def _tool_error_message(
+        self,
+        tool_function: Callable[..., Any],
+        arguments: dict[str, Any],
+        error: Exception,
+    ) -> str:
+        """Logs the error of a failed tool call, returning the message that
+        reports it to the LLM. Failed calls are never cached."""
+        if logger.isEnabledFor(logging.DEBUG):
             logger.debug(
                 "Error executing tool %s with arguments %s.",
                 tool_function.__name__,
                 arguments,
-                exc_info=True,
+                exc_info=error,
             )
-            content = f"Error executing tool: {e}"  # Return error msg to LLM
-        return str(content)
+        return f"Error executing tool: {error}"
+
+    def _resolve_tool_call(
+        self, name: str, arguments: Union[dict[str, Any], str]
+    ) -> tuple[Optional[Callable[..., Any]], Union[dict[str, Any], str]]:
+        """Looks up the tool function for a tool call and parses its arguments
+        if needed. Returns None and an error message for the LLM instead, if
+        the agent has no such tool or the arguments are not valid JSON."""
+        tool_function = self._tool_dict.get(name)
+        if tool_function is None:
+            return None, f"Error executing tool: unknown tool {name!r}"
+        if isinstance(arguments, str):
+            try:
+                arguments = _json_loads(arguments)
+            except ValueError as e:
+                return None, f"Error executing tool: invalid arguments: {e}"
+        return tool_function, arguments
+
+    def _dispatch_tool_call(
+        self, name: str, arguments: Union[dict[str, Any], str]
+    ) -> str:
+        """Runs the tool requested by a tool call. A tool the agent does not
+        have is reported back to the LLM as an error, like a failing tool."""
+        tool_function, arguments = self._resolve_tool_call(name, arguments)
+        if tool_function is None:
+            return arguments
+        return self._execute_tool_call(tool_function, arguments)
+
+    async def _adispatch_tool_call(
+        self, name: str, arguments: Union[dict[str, Any], str]
+    ) -> str:
+        """Asynchronously runs the tool requested by a tool call."""
+        tool_function, arguments = self._resolve_tool_call(name, arguments)
+        if tool_function is None:
+            return arguments
+        return await self._aexecute_tool_call(tool_function, arguments)
 
     def _call_tools(self, tool_calls: list[Any]) -> list[dict[str, Any]]:
-        tool_dict = {tool.__name__: tool for tool in self.tools}
-        tool_messages = [
-            {
-                "role": "tool",
-                "tool_call_id": tool_call.id,
-                "content": self._execute_tool_call(
-                    tool_dict[tool_call.function.name],
-                    json.loads(tool_call.function.arguments),
-                ),
-            }
-            for tool_call in tool_calls
+        """Runs the requested tools."""
+        n_tool_calls = len(tool_calls)
+        # Each result is stored at the index of its call, so the results
+        # stay in call order however the tools finish.
+        contents = [None] * n_tool_calls
+        dispatch_tool_call = self._dispatch_tool_call
+        if self.parallel_tools and n_tool_calls > 1:
+            # Independent tool calls run concurrently, so a turn takes as
+            # long as its slowest tool rather than the sum of all of them.
+            max_workers = min(_MAX_TOOL_WORKERS, n_tool_calls)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for i, tool_call in enumerate(tool_calls):
+                    function = tool_call.function
+                    contents[i] = executor.submit(
+                        dispatch_tool_call, function.name, function.arguments
+                    )
+            for i, future in enumerate(contents):
+                contents[i] = future.result()
+        else:
+            for i, tool_call in enumerate(tool_calls):
+                function = tool_call.function
+                contents[i] = dispatch_tool_call(function.name, function.arguments)
+        return self._build_tool_messages(tool_calls, contents)
+
+    async def _acall_tools(self, tool_calls: list[Any]) -> list[dict[str, Any]]:
+        """Asynchronously runs the requested tools, concurrently unless
+        `parallel_tools` is disabled."""
+        names = [tc.function.name for tc in tool_calls]
+        arguments = [tc.function.arguments for tc in tool_calls]
+        if self.parallel_tools:
+            contents = await asyncio.gather(
+                *map(self._adispatch_tool_call, names, arguments)
+            )
+        else:
+            contents = [
+                await self._adispatch_tool_call(name, args)
+                for name, args in zip(names, arguments)
+            ]
+        return self._build_tool_messages(tool_calls, contents)
+
+    def _build_tool_messages(
+        self, tool_calls: list[Any], contents: list[str]
+    ) -> list[dict[str, Any]]:
+        """Pairs tool results with their calls, preserving the call order."""
+        return [
+            _tool_message(tool_call.id, content)
+            for tool_call, content in zip(tool_calls, contents)
         ]
-        return tool_messages
 
     def _get_final_response(
         self, completion_context: list[Any]
@@ -263,10 +1289,10 @@ class Agent:
             return last_message.content
 
         parsed_data = last_message.parsed
-        if isinstance(self.response_format, type) and issubclass(
-            self.response_format, BaseModel
-        ):
-            return self.response_format(**parsed_data)
+        if self._response_adapter is not None:
+            # Providers may parse the response into a dict or directly into
+            # the response model, which the adapter accepts as is.
+            return self._response_adapter.validate_python(parsed_data)
         return parsed_data
 
     def complete(
@@ -288,14 +1314,142 @@ class Agent:
             The agent's response, which can be a string, a Pydantic model, a
             dictionary, or a generator of strings if streaming.
         """
-        completion = self.complete_with_context(prompt=prompt, stream=stream)
+        start_ns = time.perf_counter_ns()
         if stream:
-            return self._stream_content(completion)
-        else:
-            return self._get_final_response(completion)
+            if self.tools or self.stream_batch_chars:
+                completion = self.complete_with_context(prompt=prompt, stream=True)
+                content = self._stream_content(completion)
+            else:
+                # Nothing to accumulate, so read the content straight from
+                # the chunks, skipping the _stream_messages() layer.
+                messages = self._build_messages(self._default_context, prompt)
+                completion = self._create_completion(messages, stream=True)
+                content = self._stream_raw_content(completion)
+            if self.on_metrics is not None:
+                content = self._time_stream(content, start_ns)
+            return content
+        completion = self.complete_with_context(prompt=prompt)
+        if self.on_metrics is not None:
+            self.on_metrics({"total_ns": time.perf_counter_ns() - start_ns})
+        return self._get_final_response(completion)
+
+    async def acomplete(
+        self, prompt: Union[str, dict[str, Any]], stream: bool = False
+    ) -> Union[str, AsyncGenerator[str, None], BaseModel, dict[str, Any]]:
+        """Asynchronously executes a prompt and returns the agent's response.
+
+        This is the asynchronous counterpart of `complete`. Awaiting many
+        `acomplete` calls together (e.g., with `asyncio.gather`) overlaps
+        their network waits instead of serializing them.
+
+        Args:
+            prompt: The user prompt. Can be a string or a dictionary if the
+                agent was configured with a `prompt_template`.
+            stream: If True, the response will be returned as an async
+                generator of string chunks. Defaults to False.
+
+        Returns:
+            The agent's response, which can be a string, a Pydantic model, a
+            dictionary, or an async generator of strings if streaming.
+        """
+        start_ns = time.perf_counter_ns()
+        if stream:
+            if self.tools or self.stream_batch_chars:
+                completion = await self.acomplete_with_context(
+                    prompt=prompt, stream=True
+                )
+                content = self._astream_content(completion)
+            else:
+                messages = self._build_messages(self._default_context, prompt)
+                completion = await self._acreate_completion(messages, stream=True)
+                content = self._astream_raw_content(completion)
+            if self.on_metrics is not None:
+                content = self._atime_stream(content, start_ns)
+            return content
+        completion = await self.acomplete_with_context(prompt=prompt)
+        if self.on_metrics is not None:
+            self.on_metrics({"total_ns": time.perf_counter_ns() - start_ns})
+        return self._get_final_response(completion)
+
+    def batch_complete(
+        self, prompts: list[Union[str, dict[str, Any]]], max_concurrency: int = 8
+    ) -> list[Union[str, BaseModel, dict[str, Any]]]:
+        """Executes many independent prompts concurrently.
+
+        Each prompt is completed as by `complete`, on a pool of threads, so
+        that the requests to the LLM overlap instead of being sent one after
+        the other.
+
+        Args:
+            prompts: The user prompts, as accepted by `complete`.
+            max_concurrency: The maximum number of prompts completed at once,
+                e.g., to stay within the provider's rate limits. Defaults to
+                8.
+
+        Returns:
+            The agent's responses, in the order of the prompts.
+
+        Raises:
+            ValueError: If `max_concurrency` is less than 1.
+            Exception: The first error, in prompt order, raised by any of
+                the completions.
+        """
+        _check_max_concurrency(max_concurrency)
+        if len(prompts) <= 1:
+            return [self.complete(prompt) for prompt in prompts]
+        max_workers = min(max_concurrency, len(prompts))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.complete, prompts))
+
+    async def abatch_complete(
+        self, prompts: list[Union[str, dict[str, Any]]], max_concurrency: int = 8
+    ) -> list[Union[str, BaseModel, dict[str, Any]]]:
+        """Asynchronously executes many independent prompts concurrently.
+
+        This is the asynchronous counterpart of `batch_complete`, running at
+        most `max_concurrency` `acomplete` calls at a time.
+
+        Args:
+            prompts: The user prompts, as accepted by `acomplete`.
+            max_concurrency: The maximum number of prompts completed at once.
+                Defaults to 8.
+
+        Returns:
+            The agent's responses, in the order of the prompts.
+
+        Raises:
+            ValueError: If `max_concurrency` is less than 1.
+        """
+        _check_max_concurrency(max_concurrency)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def acomplete(prompt: Union[str, dict[str, Any]]) -> Any:
+            async with semaphore:
+                return await self.acomplete(prompt)
+
+        return await asyncio.gather(*map(acomplete, prompts))
+
+    async def acomplete_broadcast(
+        self, prompt: Union[str, dict[str, Any]]
+    ) -> StreamBroadcaster:
+        """Streams the agent's response to any number of consumers at once.
+
+        The response is requested and streamed from the LLM only once, and
+        each chunk is delivered to every subscriber as soon as it arrives.
+
+        Args:
+            prompt: The user prompt. Can be a string or a dictionary if the
+                agent was configured with a `prompt_template`.
+
+        Returns:
+            A `StreamBroadcaster`. Call its `subscribe()` method once per
+            consumer, before iterating any of the subscriptions.
+        """
+        return StreamBroadcaster(await self.acomplete(prompt, stream=True))
 
     def __repr__(self) -> str:
-        tool_names = [tool.__name__ for tool in self.tools]
+        # Instructions can run to several kilobytes, so only show their start.
+        instructions = textwrap.shorten(self.instructions, width=80, placeholder=" ...")
         response_format_repr = (
             self.response_format.__name__
             if isinstance(self.response_format, type)
@@ -304,8 +1458,8 @@ class Agent:
         return (
             f"Agent("
             f"model={self.model!r}, "
-            f"instructions={self.instructions!r}, "
-            f"tools={tool_names}, "
+            f"instructions={instructions!r}, "
+            f"tools={list(self._tool_dict)}, "
             f"response_format={response_format_repr}, "
             f"prompt_template={self.prompt_template!r}, "
             f"params={self.params}"
@@ -313,9 +1467,39 @@ class Agent:
         )
 
 
+# The defaults of the Agent options added after its original six
+# parameters. The builder only passes the options that differ from these, so
+# that Agent subclasses overriding __init__ with the original parameters
+# still work with it.
+_AGENT_OPTION_DEFAULTS = {
+    "cache_size": 0,
+    "on_metrics": None,
+    "parallel_tools": False,
+    "tool_cache_size": 0,
+    "tool_cache_ttl": None,
+    "stream_batch_chars": 0,
+}
+
+
 class AgentBuilder:
     """A fluent builder for creating and configuring Agent instances."""
 
+    __slots__ = (
+        "agent_cls",
+        "model",
+        "instructions",
+        "response_format",
+        "prompt_template",
+        "params",
+        "tools",
+        "cache_size",
+        "on_metrics",
+        "parallel_tools",
+        "tool_cache_size",
+        "tool_cache_ttl",
+        "stream_batch_chars",
+    )
+
     def __init__(self, agent_cls: Type[Agent]):
         """Initializes the AgentBuilder.
 
@@ -329,6 +1513,8 @@ class AgentBuilder:
         self.prompt_template = None
         self.params = {}
         self.tools = []
+        for name, default in _AGENT_OPTION_DEFAULTS.items():
+            setattr(self, name, default)
 
     def build(self) -> Agent:
         """Builds and returns a configured Agent instance.
@@ -337,6 +1523,11 @@ class AgentBuilder:
             A new Agent instance with the specified configuration.
         """
         assert self.model is not None, "Model must be specified"
+        options = {
+            name: getattr(self, name)
+            for name, default in _AGENT_OPTION_DEFAULTS.items()
+            if getattr(self, name) != default
+        }
         return self.agent_cls(
             self.model,
             self.instructions,
@@ -344,6 +1535,7 @@ class AgentBuilder:
             self.response_format,
             self.prompt_template,
             self.params,
+            **options,
         )
 
     def with_model(self, model: str) -> "AgentBuilder":
@@ -424,3 +1616,87 @@ class AgentBuilder:
         """
         self.params = params
         return self
+
+    def with_response_cache(self, cache_size: int) -> "AgentBuilder":
+        """Caches up to `cache_size` responses, so that repeating a request
+        returns the cached response instead of calling the LLM again.
+
+        Intended for deterministic parameters (e.g., a temperature of 0). The
+        cache is not used when streaming, and building an agent with tools or
+        a non-zero temperature disables it with a warning.
+
+        Args:
+            cache_size: The maximum number of responses to cache.
+
+        Returns:
+            The AgentBuilder instance for chaining.
+        """
+        self.cache_size = cache_size
+        return self
+
+    def with_metrics_hook(
+        self, on_metrics: Callable[[dict[str, Any]], Any]
+    ) -> "AgentBuilder":
+        """Sets a callback that receives the timings of each completion, such
+        as the time to first token of streamed responses.
+
+        Args:
+            on_metrics: A callable taking a dict of metrics. See `Agent` for
+                the reported keys.
+
+        Returns:
+            The AgentBuilder instance for chaining.
+        """
+        self.on_metrics = on_metrics
+        return self
+
+    def with_parallel_tools(self, parallel_tools: bool = True) -> "AgentBuilder":
+        """Sets whether the tool calls requested together in one turn are
+        executed concurrently. By default, they run one at a time.
+
+        Args:
+            parallel_tools: True to execute tool calls concurrently. Only
+                meant for tools that are safe to run at the same time, e.g.,
+                that do not mutate shared state.
+
+        Returns:
+            The AgentBuilder instance for chaining.
+        """
+        self.parallel_tools = parallel_tools
+        return self
+
+    def with_tool_cache(
+        self, cache_size: int, ttl: Optional[float] = None
+    ) -> "AgentBuilder":
+        """Caches up to `cache_size` tool results, so that calling a tool
+        again with the same arguments returns the cached result instead of
+        running the tool.
+
+        Intended for deterministic tools without side effects. A tool can be
+        excluded by setting a `_fllume_no_cache` attribute to True on it.
+
+        Args:
+            cache_size: The maximum number of tool results to cache.
+            ttl: The number of seconds after which a cached result expires,
+                or None for results that never expire.
+
+        Returns:
+            The AgentBuilder instance for chaining.
+        """
+        self.tool_cache_size = cache_size
+        self.tool_cache_ttl = ttl
+        return self
+
+    def with_stream_batching(self, stream_batch_chars: int) -> "AgentBuilder":
+        """Coalesces streamed tokens into chunks of at least
+        `stream_batch_chars` characters.
+
+        Args:
+            stream_batch_chars: The minimum number of characters per chunk,
+                or 0 to yield each token as it arrives.
+
+        Returns:
+            The AgentBuilder instance for chaining.
+        """
+        self.stream_batch_chars = stream_batch_chars
+        return self
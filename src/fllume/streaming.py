@@ -0,0 +1,92 @@
+import asyncio
+from typing import Any, AsyncGenerator, AsyncIterator, Optional
+
+# Marks the end of the upstream stream in each subscriber's queue.
+_END_OF_STREAM = object()
+
+
+class StreamBroadcaster:
+    """Shares a single stream of response chunks among many async consumers.
+
+    The upstream stream is consumed exactly once, and every chunk is handed
+    to each subscriber as soon as it arrives, so that, e.g., a UI, a logger
+    and a recorder can all follow one LLM response without requesting it
+    more than once.
+
+    Typically obtained from `Agent.acomplete_broadcast()`. All subscribers
+    must call `subscribe()` before any of them starts iterating. The
+    upstream stream is closed early once every subscriber has stopped
+    iterating, and if the broadcast is cancelled, the subscribers that are
+    still iterating raise `asyncio.CancelledError` instead of ending.
+    """
+
+    def __init__(self, stream: AsyncIterator[Any]):
+        """Initializes the StreamBroadcaster.
+
+        Args:
+            stream: The async iterator of chunks to share.
+        """
+        self._stream = stream
+        self._queues: list[asyncio.Queue] = []
+        self._task: Optional[asyncio.Task] = None
+        self._n_active = 0
+
+    def subscribe(self) -> AsyncGenerator[Any, None]:
+        """Registers a new consumer of the stream.
+
+        Returns:
+            An async generator yielding every chunk of the stream.
+
+        Raises:
+            RuntimeError: If the broadcast has already started.
+        """
+        if self._task is not None:
+            raise RuntimeError(
+                "Cannot subscribe to a stream after the broadcast has started."
+            )
+        queue = asyncio.Queue()
+        self._queues.append(queue)
+        self._n_active += 1
+        return self._consume(queue)
+
+    async def _consume(self, queue: asyncio.Queue) -> AsyncGenerator[Any, None]:
+        """Yields the chunks put into a subscriber's queue, starting the
+        broadcast on first use."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._broadcast())
+        try:
+            while True:
+                chunk = await queue.get()
+                if chunk is _END_OF_STREAM:
+                    return
+                if isinstance(chunk, BaseException):
+                    raise chunk
+                yield chunk
+        finally:
+            self._n_active -= 1
+            if self._n_active == 0:
+                # Nobody is listening anymore, so stop reading upstream
+                self._task.cancel()
+
+    async def _broadcast(self) -> None:
+        """Consumes the upstream stream, fanning each chunk out to every
+        subscriber. Upstream errors and cancellation are re-raised in each
+        subscriber, so that a cut-off response never looks complete."""
+        end: Any = _END_OF_STREAM
+        try:
+            async for chunk in self._stream:
+                for queue in self._queues:
+                    queue.put_nowait(chunk)
+        except asyncio.CancelledError as e:
+            end = e
+            raise
+        except Exception as e:
+            end = e
+        finally:
+            for queue in self._queues:
+                queue.put_nowait(end)
+            if end is not _END_OF_STREAM:
+                # Release the upstream stream, e.g., its connection
+                aclose = getattr(self._stream, "aclose", None)
+                if aclose is not None:
+                    await aclose()
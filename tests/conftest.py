@@ -0,0 +1,145 @@
+import any_llm
+import asyncio
+import fllume
+import pytest
+from types import SimpleNamespace
+from any_llm.types.completion import ChatCompletionMessage
+
+
+class FakeLLM:
+    """A scripted stand-in for the any-llm completion API.
+
+    Each scripted response is either a string, for a text response, or a
+    list of (tool name, JSON arguments) pairs, for a tool call request. When
+    streamed, an exception in that list is raised at its position, and
+    `before_finish` is called before the final chunk, if set. Some
+    providers also set a finish reason after each tool call, which is
+    imitated by setting `finish_each_tool_call`.
+    """
+
+    def __init__(self):
+        self.responses = []
+        self.requests = []
+        self.closed_streams = 0
+        self.before_finish = None
+        self.finish_each_tool_call = False
+
+    def script(self, *responses):
+        self.responses.extend(responses)
+
+    def completion(self, model, messages, stream=False, **kwargs):
+        self.requests.append(
+            {"messages": list(messages), "stream": stream, "kwargs": kwargs}
+        )
+        response = self.responses.pop(0)
+        return self._stream(response) if stream else self._complete(response)
+
+    async def acompletion(self, model, messages, stream=False, **kwargs):
+        self.requests.append(
+            {"messages": list(messages), "stream": stream, "kwargs": kwargs}
+        )
+        response = self.responses.pop(0)
+        return self._astream(response) if stream else self._complete(response)
+
+    def _complete(self, response):
+        if isinstance(response, str):
+            message = ChatCompletionMessage(role="assistant", content=response)
+        else:
+            message = ChatCompletionMessage.model_validate(
+                {
+                    "role": "assistant",
+                    "tool_calls": [
+                        {
+                            "id": f"call_{i}",
+                            "type": "function",
+                            "function": {"name": name, "arguments": arguments},
+                        }
+                        for i, (name, arguments) in enumerate(response)
+                    ],
+                }
+            )
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    def _chunks(self, response):
+        if isinstance(response, str):
+            for i in range(0, len(response), 3):
+                yield _chunk(content=response[i : i + 3])
+            yield _chunk(finish_reason="stop")
+            return
+        for i, tool_call in enumerate(response):
+            if isinstance(tool_call, Exception):
+                raise tool_call
+            name, arguments = tool_call
+            yield _chunk(tool_calls=[_tool_call_delta(i, "", f"call_{i}", name)])
+            # Split the arguments into fragments, like a provider would
+            for j in range(0, len(arguments), 4):
+                yield _chunk(tool_calls=[_tool_call_delta(i, arguments[j : j + 4])])
+            if self.finish_each_tool_call:
+                yield _chunk(
+                    tool_calls=[_tool_call_delta(i, "")], finish_reason="tool_calls"
+                )
+        if self.before_finish is not None:
+            self.before_finish()
+        yield _chunk(
+            finish_reason="stop" if self.finish_each_tool_call else "tool_calls"
+        )
+
+    def _stream(self, response):
+        try:
+            yield from self._chunks(response)
+        finally:
+            self.closed_streams += 1
+
+    async def _astream(self, response):
+        try:
+            for chunk in self._chunks(response):
+                # Let other tasks run between chunks, like a network stream
+                await asyncio.sleep(0)
+                yield chunk
+        finally:
+            self.closed_streams += 1
+
+
+def _chunk(content=None, tool_calls=None, finish_reason=None):
+    delta = SimpleNamespace(content=content, tool_calls=tool_calls)
+    choice = SimpleNamespace(delta=delta, finish_reason=finish_reason)
+    return SimpleNamespace(choices=[choice])
+
+
+def _tool_call_delta(index, arguments, id=None, name=None):
+    function = SimpleNamespace(name=name, arguments=arguments)
+    return SimpleNamespace(index=index, id=id, function=function)
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    """Replaces the any-llm completion API with a scripted FakeLLM."""
+    llm = FakeLLM()
+    monkeypatch.setattr(any_llm, "completion", llm.completion)
+    monkeypatch.setattr(any_llm, "acompletion", llm.acompletion)
+    return llm
+
+
+class FakeClock:
+    """A clock that only moves when told to, or by `step` seconds each time
+    the performance counter is read."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.step = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    def perf_counter_ns(self):
+        now = self.now
+        self.now += self.step
+        return int(now * 1e9)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replaces the clock of the agent module with a FakeClock."""
+    fake_clock = FakeClock()
+    monkeypatch.setattr(fllume.agent, "time", fake_clock)
+    return fake_clock
@@ -1,9 +1,25 @@
+import asyncio
+import datetime
+import importlib.util
+import json
+import pickle
 import pytest
 import os
+import sys
+import numpy as np
+import pandas as pd
 import fllume
+from decimal import Decimal
 from dotenv import load_dotenv
-from typing import Generator
+from typing import AsyncGenerator, Generator
 from pydantic import BaseModel
+from types import SimpleNamespace
+from any_llm.types.completion import (
+    ChatCompletionMessage,
+    ChatCompletionMessageFunctionToolCall,
+    Function,
+)
+from fllume.agent import _StreamedToolCall, _build_tool_call_message
 
 load_dotenv()
 
@@ -118,3 +134,216 @@ def test_agent_response_format():
     assert isinstance(response, User)
     assert response.name == "Jean-Luc"
     assert response.age == 59
+
+
+@requires_openai
+def test_agent_async_completion():
+    agent = fllume.Agent.builder().with_model(MODEL).build()
+
+    async def complete_all():
+        return await asyncio.gather(
+            agent.acomplete("What is the capital of France?"),
+            agent.acomplete("What is the capital of Italy?"),
+        )
+
+    france, italy = asyncio.run(complete_all())
+
+    assert "Paris" in france
+    assert "Rome" in italy
+
+
+@requires_openai
+def test_agent_async_tool_calling_streaming():
+    agent = fllume.Agent.builder().with_model(MODEL).with_tools([get_user_name]).build()
+    prompt = "What is the username for user ID 123?"
+
+    async def collect():
+        stream = await agent.acomplete(prompt, stream=True)
+        assert isinstance(stream, AsyncGenerator)
+        return [chunk async for chunk in stream]
+
+    response_parts = asyncio.run(collect())
+
+    assert all(isinstance(chunk, str) for chunk in response_parts)
+    assert "Alice" in "".join(response_parts)
+
+
+@requires_openai
+def test_agent_response_cache():
+    agent = (
+        fllume.Agent.builder()
+        .with_model(MODEL)
+        .with_params({"temperature": 0})
+        .with_response_cache(8)
+        .build()
+    )
+    prompt = "Name a primary color."
+
+    assert agent.complete(prompt) == agent.complete(prompt)
+
+
+def test_streamed_tool_call_message_matches_validated_message():
+    tool_call = _StreamedToolCall(
+        SimpleNamespace(
+            id="call_0",
+            function=SimpleNamespace(name="to_uppercase", arguments='{"te'),
+        )
+    )
+    tool_call.argument_parts.append('xt": "hi"}')
+    tool_call.finish()
+
+    validated = ChatCompletionMessage(
+        role="assistant",
+        content=None,
+        tool_calls=[
+            ChatCompletionMessageFunctionToolCall(
+                id="call_0",
+                function=Function(name="to_uppercase", arguments='{"text": "hi"}'),
+                type="function",
+            )
+        ],
+    )
+    constructed = _build_tool_call_message([tool_call])
+    assert constructed == validated
+    assert constructed.model_dump(exclude_none=True) == validated.model_dump(
+        exclude_none=True
+    )
+
+
+@requires_openai
+def test_agent_batch_completion():
+    agent = (
+        fllume.Agent.builder()
+        .with_model(MODEL)
+        .with_prompt_template("What is the capital of {country}?")
+        .build()
+    )
+    countries = [{"country": "France"}, {"country": "Italy"}]
+    responses = agent.batch_complete(countries)
+    assert "Paris" in responses[0]
+    assert "Rome" in responses[1]
+
+    responses = asyncio.run(agent.abatch_complete(countries, max_concurrency=1))
+    assert "Paris" in responses[0]
+    assert "Rome" in responses[1]
+
+
+def test_structured_response_is_validated_into_response_format():
+    class Capital(BaseModel):
+        city: str
+        country: str
+
+    agent = (
+        fllume.Agent.builder()
+        .with_model("test_provider/test_model")
+        .with_response_format(Capital)
+        .build()
+    )
+    paris = Capital(city="Paris", country="France")
+    for parsed in [paris.model_dump(), paris]:
+        response = agent._get_final_response([SimpleNamespace(parsed=parsed)])
+        assert response == paris
+
+
+@pytest.mark.parametrize(
+    "template, fields",
+    [
+        ("What is the capital of {country}?", {"country": "France"}),
+        ("{a}{b} and {a} again", {"a": 1, "b": "two"}),
+        ("No fields, only {{braces}}", {}),
+        ("{value:.2f} with {name!r}", {"value": 3.14159, "name": "pi"}),
+        (
+            "{point.x} and {items[0]}",
+            {"point": SimpleNamespace(x=1), "items": ["first"]},
+        ),
+        ("Data:\n{df}", {"df": pd.DataFrame({"x": [1, 2]})}),
+    ],
+)
+def test_prompt_template_renders_like_str_format(template, fields):
+    agent = fllume.Agent("test_provider/test_model", prompt_template=template)
+    assert agent._render_prompt(fields) == template.format(**fields)
+
+
+def test_agent_with_prompt_template_can_be_pickled():
+    agent = fllume.Agent(
+        "test_provider/test_model", prompt_template="Summarize {text}."
+    )
+    restored = pickle.loads(pickle.dumps(agent))
+    assert restored.prompt_template == agent.prompt_template
+    assert restored._render_prompt({"text": "this"}) == "Summarize this."
+
+
+@pytest.fixture(params=["orjson", "json"])
+def agent_module(request, monkeypatch):
+    """The agent module, with orjson if installed, and loaded again without
+    it, so that the json module fallback is covered as well."""
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+        return fllume.agent
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    spec = importlib.util.spec_from_file_location("fllume.agent", fllume.agent.__file__)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    assert module.orjson is None
+    return module
+
+
+@pytest.mark.parametrize(
+    "content, expected",
+    [
+        ({"a": [1, 2.5, None]}, '{"a":[1,2.5,null]}'),
+        ((1, "é"), '[1,"é"]'),
+        ([float("nan"), float("inf"), {"x": -float("inf")}], '[null,null,{"x":null}]'),
+        (
+            {
+                "when": datetime.datetime(2024, 1, 2, 3, 4, 5),
+                "on": datetime.date(2024, 1, 2),
+            },
+            '{"when":"2024-01-02T03:04:05","on":"2024-01-02"}',
+        ),
+        ({"price": Decimal("1.50")}, '{"price":"1.50"}'),
+        (
+            {"values": np.array([1.0, np.nan]), "count": np.int64(3)},
+            '{"values":[1.0,null],"count":3}',
+        ),
+    ],
+    ids=["plain", "tuple", "nan", "dates", "decimal", "numpy"],
+)
+def test_tool_result_to_str_encodes_same_json_with_either_encoder(
+    agent_module, content, expected
+):
+    assert agent_module._tool_result_to_str(content) == expected
+
+
+def test_tool_result_to_str_falls_back_to_str_for_circular_references(
+    agent_module,
+):
+    circular = [float("nan")]
+    circular.append(circular)
+    assert agent_module._tool_result_to_str(circular) == str(circular)
+
+
+def test_assigning_configuration_rebuilds_derived_values(fake_llm):
+    def add(a: int, b: int) -> int:
+        """Adds two numbers."""
+        return a + b
+
+    fake_llm.script("first", '{"name": "Ada", "age": 36}')
+    agent = fllume.Agent("test_provider/test_model", prompt_template="Hi {name}.")
+    agent.complete({"name": "Ada"})
+
+    agent.instructions = "Be brief."
+    agent.prompt_template = "Bye {name}."
+    agent.params = {"temperature": 0}
+    agent.tools = [add]
+    agent.response_format = User
+    agent.complete_with_context(prompt={"name": "Ada"})
+
+    request = fake_llm.requests[-1]
+    assert request["messages"] == [
+        {"role": "system", "content": "Be brief."},
+        {"role": "user", "content": "Bye Ada."},
+    ]
+    assert request["kwargs"]["temperature"] == 0
+    assert request["kwargs"]["response_format"] is User
+    assert [tool["function"]["name"] for tool in request["kwargs"]["tools"]] == ["add"]
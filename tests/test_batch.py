@@ -0,0 +1,55 @@
+import any_llm
+import asyncio
+import pytest
+import time
+import fllume
+
+MODEL = "test_provider/test_model"
+
+
+CAPITALS = {"France": "Paris", "Italy": "Rome", "Japan": "Tokyo"}
+
+
+@pytest.fixture
+def capital_llm(monkeypatch, fake_llm):
+    """Answers each prompt with its capital, the first prompts slowest."""
+    delays = {"France": 0.03, "Italy": 0.02, "Japan": 0.01}
+
+    def completion(model, messages, stream=False, **kwargs):
+        country = messages[-1]["content"]
+        time.sleep(delays[country])
+        return fake_llm._complete(CAPITALS[country])
+
+    async def acompletion(model, messages, stream=False, **kwargs):
+        country = messages[-1]["content"]
+        await asyncio.sleep(delays[country])
+        return fake_llm._complete(CAPITALS[country])
+
+    monkeypatch.setattr(any_llm, "completion", completion)
+    monkeypatch.setattr(any_llm, "acompletion", acompletion)
+
+
+@pytest.mark.parametrize("max_concurrency", [1, 3])
+def test_batch_complete_returns_responses_in_prompt_order(capital_llm, max_concurrency):
+    agent = fllume.Agent(MODEL)
+    responses = agent.batch_complete(list(CAPITALS), max_concurrency)
+    assert responses == list(CAPITALS.values())
+
+
+@pytest.mark.parametrize("max_concurrency", [1, 3])
+def test_abatch_complete_returns_responses_in_prompt_order(
+    capital_llm, max_concurrency
+):
+    agent = fllume.Agent(MODEL)
+    responses = asyncio.run(agent.abatch_complete(list(CAPITALS), max_concurrency))
+    assert responses == list(CAPITALS.values())
+
+
+@pytest.mark.parametrize("prompts", [[], ["France"], ["France", "Italy"]])
+def test_batch_complete_rejects_zero_concurrency(fake_llm, prompts):
+    agent = fllume.Agent(MODEL)
+    with pytest.raises(ValueError, match="max_concurrency must be at least 1"):
+        agent.batch_complete(prompts, max_concurrency=0)
+    with pytest.raises(ValueError, match="max_concurrency must be at least 1"):
+        asyncio.run(agent.abatch_complete(prompts, max_concurrency=0))
+    assert fake_llm.requests == []
@@ -1,3 +1,4 @@
+import weakref
 import pytest
 import fllume
 from pydantic import BaseModel
@@ -41,6 +42,15 @@ def test_agent_builder_with_tools():
     assert agent.tools == tools
 
 
+def test_agent_builder_fails_if_tool_has_no_docstring():
+    def undocumented(text: str) -> str:
+        return text
+
+    builder = fllume.Agent.builder().with_model("test_provider/test_model")
+    with pytest.raises(ValueError, match="must have a docstring"):
+        builder.with_tools([undocumented]).build()
+
+
 class DummyModel(BaseModel):
     """A dummy Pydantic model for testing."""
 
@@ -76,3 +86,90 @@ def test_agent_builder_with_params():
     agent = fllume.Agent.builder().with_model(model_id).with_params(params).build()
     assert isinstance(agent, fllume.Agent)
     assert agent.params == params
+
+
+def test_agent_builder_with_response_cache():
+    model_id = "test_provider/test_model"
+    agent = fllume.Agent.builder().with_model(model_id).with_response_cache(16).build()
+    assert agent.cache_size == 16
+
+
+def test_agent_builder_with_metrics_hook():
+    model_id = "test_provider/test_model"
+    metrics = []
+    agent = (
+        fllume.Agent.builder().with_model(model_id).with_metrics_hook(metrics.append)
+    ).build()
+    assert agent.on_metrics == metrics.append
+
+
+def test_agent_is_unaffected_by_later_changes_to_builder_arguments():
+    model_id = "test_provider/test_model"
+    tools = [to_uppercase]
+    params = {"temperature": 0.5}
+    agent = (
+        fllume.Agent.builder()
+        .with_model(model_id)
+        .with_tools(tools)
+        .with_params(params)
+        .build()
+    )
+    tools.clear()
+    params["temperature"] = 1.0
+    assert agent.tools == [to_uppercase]
+    assert agent.params == {"temperature": 0.5}
+
+
+def test_agent_builder_with_parallel_tools():
+    model_id = "test_provider/test_model"
+    agent = fllume.Agent.builder().with_model(model_id).build()
+    assert not agent.parallel_tools
+    agent = fllume.Agent.builder().with_model(model_id).with_parallel_tools().build()
+    assert agent.parallel_tools
+
+
+def test_agent_builder_with_tool_cache():
+    model_id = "test_provider/test_model"
+    agent = fllume.Agent.builder().with_model(model_id).with_tool_cache(8, 60).build()
+    assert agent.tool_cache_size == 8
+    assert agent.tool_cache_ttl == 60
+
+
+def test_agent_builder_with_stream_batching():
+    model_id = "test_provider/test_model"
+    agent = fllume.Agent.builder().with_model(model_id).with_stream_batching(64).build()
+    assert agent.stream_batch_chars == 64
+
+
+def test_agent_and_builder_have_no_instance_dict():
+    builder = fllume.Agent.builder().with_model("test_provider/test_model")
+    agent = builder.build()
+    assert not hasattr(builder, "__dict__")
+    assert not hasattr(agent, "__dict__")
+    assert weakref.ref(agent)() is agent
+
+
+def test_agent_builder_builds_subclass_with_original_parameters():
+    class SummaryAgent(fllume.Agent):
+        def __init__(
+            self,
+            model,
+            instructions=None,
+            tools=None,
+            response_format=None,
+            prompt_template=None,
+            params=None,
+        ):
+            super().__init__(
+                model, instructions, tools, response_format, prompt_template, params
+            )
+
+    agent = (
+        SummaryAgent.builder()
+        .with_model("test_provider/test_model")
+        .with_instructions("Summarize.")
+        .build()
+    )
+    assert isinstance(agent, SummaryAgent)
+    assert agent.instructions == "Summarize."
+    assert agent.cache_size == 0
@@ -0,0 +1,194 @@
+import asyncio
+import pickle
+import pytest
+import fllume
+from fllume.agent import _LRUCache
+
+MODEL = "test_provider/test_model"
+
+
+def test_lru_cache_returns_cached_value():
+    cache = _LRUCache(2)
+    cache.put("a", 1)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+
+
+def test_lru_cache_evicts_least_recently_used_at_maxsize():
+    cache = _LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_lru_cache_expires_entries_after_ttl(clock):
+    cache = _LRUCache(2, ttl=10)
+    cache.put("a", 1)
+    clock.now = 9.9
+    assert cache.get("a") == 1
+    clock.now = 10
+    assert cache.get("a") is None
+
+
+def make_add(calls, failures=0):
+    def add(a: int, b: int) -> int:
+        """Adds two numbers."""
+        calls.append((a, b))
+        if len(calls) <= failures:
+            raise RuntimeError("temporarily unavailable")
+        return a + b
+
+    return add
+
+
+def complete_twice(fake_llm, agent, first_arguments, second_arguments):
+    fake_llm.script(
+        [("add", first_arguments)], "done", [("add", second_arguments)], "done"
+    )
+    agent.complete("Add")
+    agent.complete("Add")
+    return [request["messages"][-1]["content"] for request in fake_llm.requests[1::2]]
+
+
+def test_tool_cache_returns_cached_result_for_same_arguments(fake_llm):
+    calls = []
+    agent = fllume.Agent(MODEL, tools=[make_add(calls)], tool_cache_size=8)
+
+    contents = complete_twice(fake_llm, agent, '{"a": 1, "b": 2}', '{"b": 2, "a": 1}')
+
+    assert contents == ["3", "3"]
+    assert calls == [(1, 2)]
+
+
+def test_async_tool_cache_returns_cached_result(fake_llm):
+    calls = []
+
+    async def fetch(key: str) -> str:
+        """Fetches the value of a key."""
+        calls.append(key)
+        return key.upper()
+
+    fake_llm.script(
+        [("fetch", '{"key": "a"}')], "done", [("fetch", '{"key": "a"}')], "done"
+    )
+    agent = fllume.Agent(MODEL, tools=[fetch], tool_cache_size=8)
+
+    async def complete_twice():
+        await agent.acomplete("Fetch a")
+        await agent.acomplete("Fetch a")
+
+    asyncio.run(complete_twice())
+    assert calls == ["a"]
+
+
+def test_tool_cache_evicts_least_recently_used_at_maxsize(fake_llm):
+    calls = []
+    agent = fllume.Agent(MODEL, tools=[make_add(calls)], tool_cache_size=1)
+    for a in [1, 2, 1]:
+        fake_llm.script([("add", f'{{"a": {a}, "b": 0}}')], "done")
+
+    for _ in range(3):
+        agent.complete("Add")
+
+    assert calls == [(1, 0), (2, 0), (1, 0)]
+
+
+def test_tool_cache_expires_results_after_ttl(fake_llm, clock):
+    calls = []
+    agent = fllume.Agent(
+        MODEL, tools=[make_add(calls)], tool_cache_size=8, tool_cache_ttl=60
+    )
+    fake_llm.script(
+        [("add", '{"a": 1, "b": 2}')], "done", [("add", '{"a": 1, "b": 2}')], "done"
+    )
+
+    agent.complete("Add")
+    clock.now = 60
+    agent.complete("Add")
+
+    assert calls == [(1, 2), (1, 2)]
+
+
+def test_tool_cache_skips_tools_that_opt_out(fake_llm):
+    calls = []
+    add = make_add(calls)
+    add._fllume_no_cache = True
+    agent = fllume.Agent(MODEL, tools=[add], tool_cache_size=8)
+
+    contents = complete_twice(fake_llm, agent, '{"a": 1, "b": 2}', '{"a": 1, "b": 2}')
+
+    assert contents == ["3", "3"]
+    assert calls == [(1, 2), (1, 2)]
+
+
+def test_tool_cache_does_not_cache_failed_calls(fake_llm):
+    calls = []
+    agent = fllume.Agent(MODEL, tools=[make_add(calls, failures=1)], tool_cache_size=8)
+
+    contents = complete_twice(fake_llm, agent, '{"a": 1, "b": 2}', '{"a": 1, "b": 2}')
+
+    assert contents == ["Error executing tool: temporarily unavailable", "3"]
+    assert calls == [(1, 2), (1, 2)]
+
+
+def test_response_cache_returns_cached_response(fake_llm):
+    fake_llm.script("Paris")
+    agent = fllume.Agent(MODEL, cache_size=8)
+
+    assert agent.complete("Capital of France?") == "Paris"
+    assert agent.complete("Capital of France?") == "Paris"
+    assert len(fake_llm.requests) == 1
+
+
+def test_async_response_cache_returns_cached_response(fake_llm):
+    fake_llm.script("Paris")
+    agent = fllume.Agent(MODEL, cache_size=8)
+
+    async def complete_twice():
+        return [await agent.acomplete("Capital of France?") for _ in range(2)]
+
+    assert asyncio.run(complete_twice()) == ["Paris", "Paris"]
+    assert len(fake_llm.requests) == 1
+
+
+def test_response_cache_is_not_used_for_streams(fake_llm):
+    fake_llm.script("Paris", "Paris")
+    agent = fllume.Agent(MODEL, cache_size=8)
+
+    for _ in range(2):
+        assert "".join(agent.complete("Capital of France?", stream=True)) == "Paris"
+    assert len(fake_llm.requests) == 2
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{"tools": [make_add([])]}, {"params": {"temperature": 0.7}}],
+    ids=["tools", "temperature"],
+)
+def test_response_cache_is_disabled_with_warning(fake_llm, options):
+    fake_llm.script("Paris", "Paris")
+    with pytest.warns(UserWarning, match="cache_size is ignored"):
+        agent = fllume.Agent(MODEL, cache_size=8, **options)
+
+    assert agent.cache_size == 0
+    agent.complete("Capital of France?")
+    agent.complete("Capital of France?")
+    assert len(fake_llm.requests) == 2
+
+
+def test_agent_with_caches_can_be_pickled(fake_llm):
+    fake_llm.script("Paris", "Paris")
+    agent = fllume.Agent(MODEL, cache_size=8, tool_cache_size=8)
+    agent.complete("Capital of France?")
+
+    copy = pickle.loads(pickle.dumps(agent))
+
+    assert copy.cache_size == 8
+    assert copy.tool_cache_size == 8
+    # The cache of the copy starts out empty
+    assert copy.complete("Capital of France?") == "Paris"
+    assert len(fake_llm.requests) == 2
@@ -0,0 +1,101 @@
+import asyncio
+import pytest
+import fllume
+
+MODEL = "test_provider/test_model"
+
+# With the clock advancing a second per reading, a stream is timed as: the
+# call starts at 0s, the first chunk arrives at 1s and the stream ends at 2s.
+STREAM_METRICS = {
+    "total_ns": 2_000_000_000,
+    "chunks": 3,
+    "ttft_ns": 1_000_000_000,
+    "chunks_per_second": 2.0,
+}
+
+
+def add(a: int, b: int) -> int:
+    """Adds two numbers."""
+    return a + b
+
+
+@pytest.fixture
+def metrics(clock):
+    clock.step = 1.0
+    return []
+
+
+@pytest.fixture(params=[[], [add]], ids=["no tools", "tools"])
+def tools(request, fake_llm):
+    if request.param:
+        fake_llm.script([("add", '{"a": 1, "b": 2}')])
+    return request.param
+
+
+def test_metrics_hook_receives_total_time(fake_llm, metrics, tools):
+    fake_llm.script("Paris")
+    agent = fllume.Agent(MODEL, tools=tools, on_metrics=metrics.append)
+
+    assert agent.complete("Capital of France?") == "Paris"
+    assert metrics == [{"total_ns": 1_000_000_000}]
+
+
+def test_async_metrics_hook_receives_total_time(fake_llm, metrics, tools):
+    fake_llm.script("Paris")
+    agent = fllume.Agent(MODEL, tools=tools, on_metrics=metrics.append)
+
+    assert asyncio.run(agent.acomplete("Capital of France?")) == "Paris"
+    assert metrics == [{"total_ns": 1_000_000_000}]
+
+
+def test_metrics_hook_receives_stream_timings(fake_llm, metrics, tools):
+    fake_llm.script("Paris, ok")
+    agent = fllume.Agent(MODEL, tools=tools, on_metrics=metrics.append)
+
+    stream = agent.complete("Capital of France?", stream=True)
+    assert metrics == []
+    assert "".join(stream) == "Paris, ok"
+    assert metrics == [STREAM_METRICS]
+
+
+def test_async_metrics_hook_receives_stream_timings(fake_llm, metrics, tools):
+    fake_llm.script("Paris, ok")
+    agent = fllume.Agent(MODEL, tools=tools, on_metrics=metrics.append)
+
+    async def run():
+        stream = await agent.acomplete("Capital of France?", stream=True)
+        assert metrics == []
+        return "".join([chunk async for chunk in stream])
+
+    assert asyncio.run(run()) == "Paris, ok"
+    assert metrics == [STREAM_METRICS]
+
+
+def test_metrics_hook_receives_timings_of_closed_stream(fake_llm, metrics, tools):
+    fake_llm.script("Paris, ok")
+    agent = fllume.Agent(MODEL, tools=tools, on_metrics=metrics.append)
+
+    stream = agent.complete("Capital of France?", stream=True)
+    assert next(stream) == "Par"
+    stream.close()
+
+    # A single chunk has no rate
+    assert metrics == [
+        {"total_ns": 2_000_000_000, "chunks": 1, "ttft_ns": 1_000_000_000}
+    ]
+
+
+def test_async_metrics_hook_receives_timings_of_closed_stream(fake_llm, metrics, tools):
+    fake_llm.script("Paris, ok")
+    agent = fllume.Agent(MODEL, tools=tools, on_metrics=metrics.append)
+
+    async def run():
+        stream = await agent.acomplete("Capital of France?", stream=True)
+        first_chunk = await anext(stream)
+        await stream.aclose()
+        return first_chunk
+
+    assert asyncio.run(run()) == "Par"
+    assert metrics == [
+        {"total_ns": 2_000_000_000, "chunks": 1, "ttft_ns": 1_000_000_000}
+    ]
@@ -0,0 +1,155 @@
+import asyncio
+import pytest
+import fllume
+
+
+async def chunk_stream(chunks, error=None):
+    for chunk in chunks:
+        await asyncio.sleep(0)
+        yield chunk
+    if error is not None:
+        raise error
+
+
+def test_broadcaster_delivers_every_chunk_to_each_subscriber():
+    chunks = ["The", " capital", " is", " Paris."]
+
+    async def consume():
+        broadcaster = fllume.StreamBroadcaster(chunk_stream(chunks))
+        subscriptions = [broadcaster.subscribe() for _ in range(3)]
+
+        async def collect(subscription):
+            return [chunk async for chunk in subscription]
+
+        return await asyncio.gather(*map(collect, subscriptions))
+
+    assert asyncio.run(consume()) == [chunks] * 3
+
+
+def test_broadcaster_consumes_upstream_once():
+    upstream_reads = []
+
+    async def counting_stream():
+        for chunk in ["a", "b"]:
+            upstream_reads.append(chunk)
+            yield chunk
+
+    async def consume():
+        broadcaster = fllume.StreamBroadcaster(counting_stream())
+        first, second = broadcaster.subscribe(), broadcaster.subscribe()
+        return [c async for c in first], [c async for c in second]
+
+    assert asyncio.run(consume()) == (["a", "b"], ["a", "b"])
+    assert upstream_reads == ["a", "b"]
+
+
+def test_broadcaster_propagates_upstream_errors():
+    async def consume():
+        broadcaster = fllume.StreamBroadcaster(
+            chunk_stream(["a"], error=ValueError("upstream failed"))
+        )
+        subscription = broadcaster.subscribe()
+        return [chunk async for chunk in subscription]
+
+    with pytest.raises(ValueError, match="upstream failed"):
+        asyncio.run(consume())
+
+
+def test_broadcaster_rejects_late_subscribers():
+    async def subscribe_late():
+        broadcaster = fllume.StreamBroadcaster(chunk_stream(["a", "b"]))
+        subscription = broadcaster.subscribe()
+        await anext(subscription)
+        broadcaster.subscribe()
+
+    with pytest.raises(RuntimeError, match="broadcast has started"):
+        asyncio.run(subscribe_late())
+
+
+class ClosableStream:
+    """An upstream stream that records whether it was closed, and blocks
+    after its chunks."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.closed = False
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for chunk in self.chunks:
+            await asyncio.sleep(0)
+            yield chunk
+        await asyncio.Event().wait()
+
+    async def aclose(self):
+        self.closed = True
+
+
+def test_broadcaster_forwards_cancellation_and_closes_upstream():
+    upstream = ClosableStream(["a", "b"])
+
+    async def consume():
+        broadcaster = fllume.StreamBroadcaster(upstream)
+        subscription = broadcaster.subscribe()
+        chunks = [await anext(subscription), await anext(subscription)]
+        broadcaster._task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await anext(subscription)
+        return chunks
+
+    assert asyncio.run(consume()) == ["a", "b"]
+    assert upstream.closed
+
+
+def test_broadcaster_closes_upstream_once_every_subscriber_stops():
+    upstream = ClosableStream(["a", "b"])
+
+    async def consume():
+        broadcaster = fllume.StreamBroadcaster(upstream)
+        first, second = broadcaster.subscribe(), broadcaster.subscribe()
+        assert await anext(first) == "a"
+        await first.aclose()
+        assert await anext(second) == "a"
+        assert not upstream.closed
+        await second.aclose()
+        await asyncio.sleep(0)
+
+    asyncio.run(consume())
+    assert upstream.closed
+
+
+def add(a: int, b: int) -> int:
+    """Adds two numbers."""
+    return a + b
+
+
+# Streamed by the fake LLM in chunks of three characters, so batches of at
+# least eight characters hold three chunks each, except the remainder.
+BATCHED_TEXT = "The capital of France is Paris."
+BATCHES = ["The capit", "al of Fra", "nce is Pa", "ris."]
+
+
+@pytest.mark.parametrize("tools", [[], [add]], ids=["no tools", "tools"])
+def test_stream_batching_joins_chunks_and_flushes_remainder(fake_llm, tools):
+    if tools:
+        fake_llm.script([("add", '{"a": 1, "b": 2}')])
+    fake_llm.script(BATCHED_TEXT)
+    agent = fllume.Agent("test_provider/test_model", tools=tools, stream_batch_chars=8)
+
+    assert list(agent.complete("Capital of France?", stream=True)) == BATCHES
+
+
+@pytest.mark.parametrize("tools", [[], [add]], ids=["no tools", "tools"])
+def test_async_stream_batching_joins_chunks_and_flushes_remainder(fake_llm, tools):
+    if tools:
+        fake_llm.script([("add", '{"a": 1, "b": 2}')])
+    fake_llm.script(BATCHED_TEXT)
+    agent = fllume.Agent("test_provider/test_model", tools=tools, stream_batch_chars=8)
+
+    async def run():
+        stream = await agent.acomplete("Capital of France?", stream=True)
+        return [chunk async for chunk in stream]
+
+    assert asyncio.run(run()) == BATCHES
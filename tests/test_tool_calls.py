@@ -0,0 +1,304 @@
+import asyncio
+import pytest
+import threading
+import time
+import fllume
+
+MODEL = "test_provider/test_model"
+
+
+async def fetch(key: str) -> str:
+    """Fetches the value of a key."""
+    await asyncio.sleep(0)
+    return key.upper()
+
+
+def test_sync_complete_runs_async_tool_inside_running_event_loop(fake_llm):
+    fake_llm.script([("fetch", '{"key": "a"}')], "done")
+    agent = fllume.Agent(MODEL, tools=[fetch], parallel_tools=False)
+
+    async def complete_in_loop():
+        return agent.complete_with_context(prompt="Fetch a")
+
+    context = asyncio.run(complete_in_loop())
+    assert context[-2]["content"] == "A"
+    assert context[-1].content == "done"
+
+
+def make_recording_tools(events):
+    def first(value: int) -> int:
+        """Records the first call."""
+        events.append("first started")
+        time.sleep(0.01)
+        events.append("first finished")
+        return value
+
+    def second(value: int) -> int:
+        """Records the second call."""
+        events.append("second started")
+        events.append("second finished")
+        return value
+
+    return [first, second]
+
+
+SEQUENTIAL_EVENTS = [
+    "first started",
+    "first finished",
+    "second started",
+    "second finished",
+]
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_tools_run_one_at_a_time_in_order_by_default(fake_llm, stream):
+    events = []
+    fake_llm.script([("first", '{"value": 1}'), ("second", '{"value": 2}')], "done")
+    agent = fllume.Agent(MODEL, tools=make_recording_tools(events))
+
+    response = agent.complete("Call both tools", stream=stream)
+    if stream:
+        response = "".join(response)
+
+    assert response == "done"
+    assert events == SEQUENTIAL_EVENTS
+    tool_messages = fake_llm.requests[-1]["messages"][-2:]
+    assert [m["content"] for m in tool_messages] == ["1", "2"]
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_async_tools_run_one_at_a_time_in_order_by_default(fake_llm, stream):
+    events = []
+    fake_llm.script([("first", '{"value": 1}'), ("second", '{"value": 2}')], "done")
+    agent = fllume.Agent(MODEL, tools=make_recording_tools(events))
+
+    async def complete():
+        response = await agent.acomplete("Call both tools", stream=stream)
+        if stream:
+            response = "".join([chunk async for chunk in response])
+        return response
+
+    assert asyncio.run(complete()) == "done"
+    assert events == SEQUENTIAL_EVENTS
+
+
+TWO_CALLS = [("first", '{"value": 1}'), ("second", '{"value": 2}')]
+
+
+@pytest.mark.parametrize("parallel_tools", [False, True])
+def test_streamed_tool_calls_are_answered_in_call_order(fake_llm, parallel_tools):
+    events = []
+
+    def first(value: int) -> int:
+        """Finishes last, if the tools run in parallel."""
+        time.sleep(0.05)
+        events.append("first")
+        return value * 10
+
+    def second(value: int) -> int:
+        """Finishes first, if the tools run in parallel."""
+        events.append("second")
+        return value * 10
+
+    fake_llm.script(TWO_CALLS, [("second", '{"value": 3}')], "done")
+    agent = fllume.Agent(MODEL, tools=[first, second], parallel_tools=parallel_tools)
+
+    assert "".join(agent.complete("Call the tools", stream=True)) == "done"
+
+    if parallel_tools:
+        assert events == ["second", "first", "second"]
+    else:
+        assert events == ["first", "second", "second"]
+    messages = fake_llm.requests[-1]["messages"]
+    assistant, *results = messages[2:5]
+    assert [tc["id"] for tc in assistant["tool_calls"]] == ["call_0", "call_1"]
+    assert [tc["function"]["arguments"] for tc in assistant["tool_calls"]] == [
+        '{"value": 1}',
+        '{"value": 2}',
+    ]
+    assert results == [
+        {"role": "tool", "tool_call_id": "call_0", "content": "10"},
+        {"role": "tool", "tool_call_id": "call_1", "content": "20"},
+    ]
+    assert messages[-1] == {"role": "tool", "tool_call_id": "call_0", "content": "30"}
+    # Every stream is closed once it has been read
+    assert fake_llm.closed_streams == 3
+
+
+@pytest.mark.parametrize("parallel_tools", [False, True])
+def test_async_streamed_tool_calls_are_answered_in_call_order(fake_llm, parallel_tools):
+    events = []
+
+    async def first(value: int) -> int:
+        """Finishes last, if the tools run in parallel."""
+        await asyncio.sleep(0.05)
+        events.append("first")
+        return value * 10
+
+    async def second(value: int) -> int:
+        """Finishes first, if the tools run in parallel."""
+        events.append("second")
+        return value * 10
+
+    fake_llm.script(TWO_CALLS, "done")
+    agent = fllume.Agent(MODEL, tools=[first, second], parallel_tools=parallel_tools)
+
+    async def run():
+        stream = await agent.acomplete("Call the tools", stream=True)
+        return "".join([chunk async for chunk in stream])
+
+    assert asyncio.run(run()) == "done"
+    assert events == (["second", "first"] if parallel_tools else ["first", "second"])
+    results = fake_llm.requests[-1]["messages"][-2:]
+    assert [m["content"] for m in results] == ["10", "20"]
+    assert fake_llm.closed_streams == 2
+
+
+def test_parallel_streamed_tool_call_starts_before_stream_ends(fake_llm):
+    events = []
+    first_started = threading.Event()
+
+    def first(value: int) -> int:
+        """Records its start."""
+        events.append("first started")
+        first_started.set()
+        return value
+
+    def second(value: int) -> int:
+        """Does nothing."""
+        return value
+
+    def before_finish():
+        first_started.wait(timeout=1)
+        events.append("stream finished")
+
+    fake_llm.before_finish = before_finish
+    fake_llm.script(TWO_CALLS, "done")
+    agent = fllume.Agent(MODEL, tools=[first, second], parallel_tools=True)
+
+    assert "".join(agent.complete("Call the tools", stream=True)) == "done"
+    assert events == ["first started", "stream finished"]
+
+
+def test_async_parallel_streamed_tool_call_starts_before_stream_ends(fake_llm):
+    events = []
+
+    async def first(value: int) -> int:
+        """Records its start."""
+        events.append("first started")
+        return value
+
+    async def second(value: int) -> int:
+        """Does nothing."""
+        return value
+
+    fake_llm.before_finish = lambda: events.append("stream finished")
+    fake_llm.script(TWO_CALLS, "done")
+    agent = fllume.Agent(MODEL, tools=[first, second], parallel_tools=True)
+
+    async def run():
+        stream = await agent.acomplete("Call the tools", stream=True)
+        return "".join([chunk async for chunk in stream])
+
+    assert asyncio.run(run()) == "done"
+    assert events == ["first started", "stream finished"]
+
+
+@pytest.mark.parametrize("parallel_tools", [False, True])
+def test_finish_reason_after_each_streamed_tool_call(fake_llm, parallel_tools):
+    # E.g., Cohere and Anthropic set a finish reason as each tool call ends
+    fake_llm.finish_each_tool_call = True
+    fake_llm.script(TWO_CALLS, "done", TWO_CALLS, "done")
+    events = []
+    agent = fllume.Agent(
+        MODEL, tools=make_recording_tools(events), parallel_tools=parallel_tools
+    )
+
+    assert "".join(agent.complete("Call the tools", stream=True)) == "done"
+
+    async def run():
+        stream = await agent.acomplete("Call the tools", stream=True)
+        return "".join([chunk async for chunk in stream])
+
+    assert asyncio.run(run()) == "done"
+    for request in fake_llm.requests[1::2]:
+        results = request["messages"][-2:]
+        assert [m.get("tool_call_id") for m in results] == ["call_0", "call_1"]
+        assert [m["content"] for m in results] == ["1", "2"]
+
+
+@pytest.mark.parametrize("parallel_tools", [False, True])
+def test_closing_stream_early_closes_upstream(fake_llm, parallel_tools):
+    fake_llm.script(TWO_CALLS, "done streaming")
+    tools = make_recording_tools([])
+    agent = fllume.Agent(MODEL, tools=tools, parallel_tools=parallel_tools)
+
+    stream = agent.complete("Call the tools", stream=True)
+    assert next(stream) == "don"
+    stream.close()
+    assert fake_llm.closed_streams == 2
+
+    fake_llm.script(TWO_CALLS, "done streaming")
+
+    async def run():
+        stream = await agent.acomplete("Call the tools", stream=True)
+        first_chunk = await anext(stream)
+        await stream.aclose()
+        return first_chunk
+
+    assert asyncio.run(run()) == "don"
+    assert fake_llm.closed_streams == 4
+
+
+def test_stream_error_does_not_wait_for_running_tools(fake_llm):
+    release = threading.Event()
+
+    def first(value: int) -> int:
+        """Blocks until released."""
+        release.wait(timeout=5)
+        return value
+
+    def second(value: int) -> int:
+        """Does nothing."""
+        return value
+
+    fake_llm.script([TWO_CALLS[0], ConnectionError("stream lost")])
+    agent = fllume.Agent(MODEL, tools=[first, second], parallel_tools=True)
+
+    start = time.perf_counter()
+    with pytest.raises(ConnectionError, match="stream lost"):
+        "".join(agent.complete("Call the tools", stream=True))
+    assert time.perf_counter() - start < 1
+    release.set()
+
+
+def test_async_stream_error_cancels_started_tools(fake_llm):
+    events = []
+
+    async def first(value: int) -> int:
+        """Sleeps until cancelled."""
+        events.append("first started")
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            events.append("first cancelled")
+            raise
+        return value
+
+    async def second(value: int) -> int:
+        """Does nothing."""
+        return value
+
+    fake_llm.script(
+        [TWO_CALLS[0], ("second", '{"value": 2}'), ConnectionError("stream lost")]
+    )
+    agent = fllume.Agent(MODEL, tools=[first, second], parallel_tools=True)
+
+    async def run():
+        stream = await agent.acomplete("Call the tools", stream=True)
+        with pytest.raises(ConnectionError, match="stream lost"):
+            [chunk async for chunk in stream]
+        await asyncio.sleep(0.01)
+        return list(events)
+
+    assert asyncio.run(run()) == ["first started", "first cancelled"]